@@ -6,15 +6,26 @@ if they don't already exist.
 """
 
 import logging
+from types import MappingProxyType
 from typing import List, Tuple
 
-from django.db import transaction
+from django.db import DataError, IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
 
 from backup.models import Account, SyncRoot
 from backup.secrets import list_accounts as list_secret_accounts
 
 logger = logging.getLogger(__name__)
 
+# Map provider string to Provider enum
+# secrets.json uses "google", model uses "google_drive"
+PROVIDER_MAP = MappingProxyType({
+    "google": "google_drive",
+    "google_drive": "google_drive",
+    "onedrive": "onedrive",
+})
+
 
 class DiscoveryResult:
     """Result of account discovery."""
@@ -57,69 +68,171 @@ def discover_accounts() -> DiscoveryResult:
 
     logger.info(f"Found {len(account_keys)} account(s) in secrets file")
 
-    # Process each account
+    # Parse account keys into (provider, email) pairs
+    parsed: list[tuple[str, str]] = []
     for account_key in account_keys:
+        # Parse account key: "provider:email"
         try:
-            # Parse account key: "provider:email"
-            parts = account_key.split(":", 1)
-            if len(parts) != 2:
-                error_msg = f"Invalid account key format: {account_key}"
-                logger.warning(error_msg)
-                result.errors.append(error_msg)
-                continue
-
-            provider_str, email = parts
-
-            # Map provider string to Provider enum
-            # secrets.json uses "google", model uses "google_drive"
-            provider_map = {
-                "google": "google_drive",
-                "google_drive": "google_drive",
-                "onedrive": "onedrive",
-            }
-
-            provider = provider_map.get(provider_str.lower())
-            if not provider:
-                error_msg = f"Unknown provider: {provider_str}"
-                logger.warning(error_msg)
-                result.errors.append(error_msg)
-                continue
-
-            # Check if account already exists
-            existing = Account.objects.filter(
-                provider=provider,
-                email=email,
-            ).first()
+            provider_str, email = account_key.split(":", 1)
+        except ValueError:
+            error_msg = f"Invalid account key format: {account_key}"
+            logger.warning(error_msg)
+            result.errors.append(error_msg)
+            continue
+
+        provider = PROVIDER_MAP.get(provider_str.lower())
+        if not provider:
+            error_msg = f"Unknown provider: {provider_str}"
+            logger.warning(error_msg)
+            result.errors.append(error_msg)
+            continue
+
+        parsed.append((provider, email))
+
+    if not parsed:
+        return result
+
+    try:
+        # Fetch all existing accounts in one query
+        lookup = Q()
+        for provider, email in parsed:
+            lookup |= Q(provider=provider, email=email)
+        existing = set(Account.objects.filter(lookup).values_list("provider", "email"))
+
+        to_create: list[tuple[str, str]] = []
+        for key in parsed:
+            if key in existing:
+                logger.debug(f"Account already exists: {key[0]} / {key[1]}")
+                result.existing_accounts.append(key)
+            else:
+                # Guard against the same account listed under two provider aliases
+                existing.add(key)
+                to_create.append(key)
+
+        if not to_create:
+            return result
+
+        try:
+            _create_accounts_bulk(to_create, result)
+        except (IntegrityError, DataError) as e:
+            # One bad row fails the whole insert; retry key by key so the
+            # valid accounts are still imported
+            logger.warning(f"Bulk account creation failed, retrying one at a time: {e}")
+            for provider, email in to_create:
+                _create_account(provider, email, result)
+
+    except Exception as e:
+        error_msg = f"Failed to create accounts: {e}"
+        logger.error(error_msg)
+        result.errors.append(error_msg)
+
+    return result
+
+
+def _create_accounts_bulk(to_create: list[tuple[str, str]], result: DiscoveryResult) -> None:
+    """
+    Insert accounts and their default sync roots in one transaction.
 
-            if existing:
-                logger.debug(f"Account already exists: {provider} / {email}")
-                result.existing_accounts.append((provider, email))
-                continue
+    Args:
+        to_create: (provider, email) pairs not found before the insert
+        result: Result to record the accounts in
 
-            # Create new account
-            with transaction.atomic():
-                account = Account.objects.create(
+    Raises:
+        IntegrityError, DataError: If any row is rejected (nothing is inserted)
+    """
+    # Rows stamped before this were inserted by someone else
+    insert_started_at = timezone.now()
+
+    with transaction.atomic():
+        Account.objects.bulk_create(
+            [
+                Account(
                     provider=provider,
                     email=email,
                     name=f"{email} ({provider.replace('_', ' ').title()})",
                     is_active=True,
                 )
+                for provider, email in to_create
+            ],
+            ignore_conflicts=True,
+        )
+
+        # bulk_create with ignore_conflicts doesn't return primary keys,
+        # so re-read the rows by key. Some may have been inserted by a
+        # concurrent discovery; ignore_conflicts on the sync roots' unique
+        # (account, provider_root_id) keeps that harmless.
+        created_lookup = Q()
+        for provider, email in to_create:
+            created_lookup |= Q(provider=provider, email=email)
+        accounts = {
+            (account.provider, account.email): account
+            for account in Account.objects.filter(created_lookup)
+        }
+
+        # Create default sync root for Google Drive
+        SyncRoot.objects.bulk_create(
+            [
+                SyncRoot(
+                    account=account,
+                    provider_root_id="root",  # Google Drive "My Drive" root
+                    name="My Drive",
+                    is_enabled=True,
+                )
+                for account in accounts.values()
+                if account.provider == "google_drive"
+            ],
+            ignore_conflicts=True,
+        )
+
+    for key in to_create:
+        account = accounts.get(key)
+        if account is None:
+            continue
+        if account.created_at >= insert_started_at:
+            logger.info(f"Created account: {key[0]} / {key[1]} (ID: {account.id})")
+            result.created_accounts.append(key)
+        else:
+            logger.debug(f"Account created concurrently: {key[0]} / {key[1]}")
+            result.existing_accounts.append(key)
+
+
+def _create_account(provider: str, email: str, result: DiscoveryResult) -> None:
+    """
+    Create a single account and its default sync root, recording any error.
 
-                # Create default sync root for Google Drive
-                if provider == "google_drive":
-                    SyncRoot.objects.create(
-                        account=account,
-                        provider_root_id="root",  # Google Drive "My Drive" root
-                        name="My Drive",
-                        is_enabled=True,
-                    )
-
-                logger.info(f"Created account: {provider} / {email} (ID: {account.id})")
-                result.created_accounts.append((provider, email))
-
-        except Exception as e:
-            error_msg = f"Failed to process {account_key}: {e}"
-            logger.error(error_msg)
-            result.errors.append(error_msg)
-
-    return result
+    Args:
+        provider: Provider value, e.g. "google_drive"
+        email: Account email
+        result: Result to record the account or error in
+    """
+    try:
+        with transaction.atomic():
+            account, created = Account.objects.get_or_create(
+                provider=provider,
+                email=email,
+                defaults={
+                    "name": f"{email} ({provider.replace('_', ' ').title()})",
+                    "is_active": True,
+                },
+            )
+
+            # Create default sync root for Google Drive
+            if created and provider == "google_drive":
+                SyncRoot.objects.create(
+                    account=account,
+                    provider_root_id="root",  # Google Drive "My Drive" root
+                    name="My Drive",
+                    is_enabled=True,
+                )
+    except (IntegrityError, DataError) as e:
+        error_msg = f"Failed to create account {provider} / {email}: {e}"
+        logger.error(error_msg)
+        result.errors.append(error_msg)
+        return
+
+    if created:
+        logger.info(f"Created account: {provider} / {email} (ID: {account.id})")
+        result.created_accounts.append((provider, email))
+    else:
+        logger.debug(f"Account already exists: {provider} / {email}")
+        result.existing_accounts.append((provider, email))
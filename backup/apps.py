@@ -1,10 +1,61 @@
 import logging
+import os
+import threading
 
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 logger = logging.getLogger(__name__)
 
 
+def _run_discovery() -> None:
+    """Discover accounts from secrets.json and log the outcome."""
+    # Import here to avoid circular imports
+    from backup.account_discovery import discover_accounts
+
+    try:
+        logger.info("Auto-discovering accounts from secrets file...")
+        result = discover_accounts()
+
+        if result.created_count > 0:
+            logger.info(
+                f"Auto-discovery: Created {result.created_count} new account(s)"
+            )
+            for provider, email in result.created_accounts:
+                logger.info(f"  ✓ {provider} / {email}")
+
+        if result.existing_accounts:
+            logger.debug(
+                f"Auto-discovery: Found {len(result.existing_accounts)} existing account(s)"
+            )
+
+        if result.errors:
+            logger.warning(
+                f"Auto-discovery: Encountered {len(result.errors)} error(s)"
+            )
+            for error in result.errors:
+                logger.warning(f"  ✗ {error}")
+
+    except Exception as e:
+        # Don't crash the app if discovery fails
+        logger.error(f"Account auto-discovery failed: {e}", exc_info=True)
+
+
+def _discover_after_migrate(sender, **kwargs) -> None:
+    """post_migrate handler: tables are guaranteed to exist at this point."""
+    _run_discovery()
+
+
+def _discover_in_background() -> None:
+    """Thread target for runserver: discover, then release the thread's DB connection."""
+    from django.db import connection
+
+    try:
+        _run_discovery()
+    finally:
+        connection.close()
+
+
 class BackupConfig(AppConfig):
     name = 'backup'
     default_auto_field = 'django.db.models.BigAutoField'
@@ -13,39 +64,25 @@ class BackupConfig(AppConfig):
         """
         Run when Django app is ready.
 
-        Auto-discovers accounts from secrets.json on startup.
+        Auto-discovers accounts from secrets.json without blocking startup:
+        after migrations via post_migrate, and in a background thread for runserver.
         """
-        # Only run in the main process (not in migrations, etc.)
+        # Only run for runserver and migrate (not tests, shell, etc.)
         import sys
-        if 'runserver' not in sys.argv and 'migrate' not in sys.argv:
+        if 'migrate' in sys.argv:
+            post_migrate.connect(_discover_after_migrate, sender=self)
+            return
+
+        if 'runserver' not in sys.argv:
+            return
+
+        # The autoreloader imports the project twice; only discover in the
+        # child process that actually serves requests
+        if os.environ.get('RUN_MAIN') != 'true' and '--noreload' not in sys.argv:
             return
 
-        # Import here to avoid circular imports
-        from backup.account_discovery import discover_accounts
-
-        try:
-            logger.info("Auto-discovering accounts from secrets file...")
-            result = discover_accounts()
-
-            if result.created_count > 0:
-                logger.info(
-                    f"Auto-discovery: Created {result.created_count} new account(s)"
-                )
-                for provider, email in result.created_accounts:
-                    logger.info(f"  ✓ {provider} / {email}")
-
-            if result.existing_accounts:
-                logger.debug(
-                    f"Auto-discovery: Found {len(result.existing_accounts)} existing account(s)"
-                )
-
-            if result.errors:
-                logger.warning(
-                    f"Auto-discovery: Encountered {len(result.errors)} error(s)"
-                )
-                for error in result.errors:
-                    logger.warning(f"  ✗ {error}")
-
-        except Exception as e:
-            # Don't crash the app if discovery fails
-            logger.error(f"Account auto-discovery failed: {e}", exc_info=True)
+        threading.Thread(
+            target=_discover_in_background,
+            name="account-discovery",
+            daemon=True,
+        ).start()
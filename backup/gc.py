@@ -8,12 +8,16 @@ according to retention policies.
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import timedelta
 from typing import TYPE_CHECKING
 
 from django.conf import settings
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 
 if TYPE_CHECKING:
@@ -25,7 +29,7 @@ from backup.storage import AccountStorage
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class GCResult:
     """Result of a garbage collection run."""
 
@@ -63,6 +67,10 @@ class GarbageCollector:
         self.account = account
         self.dry_run = dry_run
         self.batch_size = batch_size or getattr(settings, "GC_BATCH_SIZE", 100)
+        self.delete_workers = getattr(settings, "GC_DELETE_WORKERS", 16)
+        self.delete_chunk_size = getattr(settings, "GC_DELETE_CHUNK_SIZE", 10000)
+        self._storage_cache: dict[int, AccountStorage] = {}
+        self._policies: dict[int, tuple[int, int]] | None = None
 
     def run(self) -> GCResult:
         """
@@ -99,6 +107,60 @@ class GarbageCollector:
 
         return result
 
+    def has_work(self) -> bool:
+        """
+        Cheaply check whether a run could delete anything.
+
+        Issues EXISTS probes for superseded versions older than the retention
+        window, quarantined items past keep_days, and orphaned blobs. A True
+        result doesn't guarantee deletions, since keep_last_n may still
+        protect old versions.
+
+        Returns:
+            False if a full run would certainly be a no-op
+        """
+        now = timezone.now()
+
+        for (keep_n, keep_days), account_ids in self._group_accounts_by_policy().items():
+            cutoff_date = now - timedelta(days=keep_days)
+
+            old_versions = FileVersion.objects.filter(
+                account__in=account_ids, captured_at__lt=cutoff_date
+            )
+            if keep_n:
+                # An item's newest version is always kept, so an old version
+                # only counts if the same item has a newer one
+                old_versions = old_versions.filter(
+                    Exists(
+                        FileVersion.objects.filter(
+                            backup_item=OuterRef("backup_item"),
+                            captured_at__gt=OuterRef("captured_at"),
+                        )
+                    )
+                )
+            if old_versions.exists():
+                return True
+
+            if BackupItem.objects.filter(
+                sync_root__account__in=account_ids,
+                state=ItemState.QUARANTINED,
+                state_changed_at__lt=cutoff_date,
+            ).exists():
+                return True
+
+        orphaned_query = BackupBlob.objects.filter(versions__isnull=True)
+        if self.account:
+            orphaned_query = orphaned_query.filter(account=self.account)
+        return orphaned_query.exists()
+
+    def _get_storage(self, account_id: int, provider: str) -> AccountStorage:
+        """Get the AccountStorage for an account, reusing it across GC phases."""
+        storage = self._storage_cache.get(account_id)
+        if storage is None:
+            storage = AccountStorage.for_account_id(account_id, provider)
+            self._storage_cache[account_id] = storage
+        return storage
+
     def _get_retention_policy(self, account: Account) -> tuple[int, int]:
         """
         Get retention policy for an account.
@@ -106,10 +168,20 @@ class GarbageCollector:
         Returns:
             Tuple of (keep_last_n, keep_days)
         """
+        # Load all account-level policies once per GC run
+        if self._policies is None:
+            self._policies = {}
+            for policy in RetentionPolicy.objects.filter(
+                account__isnull=False, sync_root=None
+            ).order_by("pk"):
+                self._policies.setdefault(
+                    policy.account_id, (policy.keep_last_n, policy.keep_days)
+                )
+
         # Try to find account-specific policy
-        policy = RetentionPolicy.objects.filter(account=account, sync_root=None).first()
+        policy = self._policies.get(account.id)
         if policy:
-            return policy.keep_last_n, policy.keep_days
+            return policy
 
         # Fall back to defaults
         return (
@@ -117,6 +189,22 @@ class GarbageCollector:
             getattr(settings, "GC_DEFAULT_KEEP_DAYS", 30),
         )
 
+    def _group_accounts_by_policy(self) -> dict[tuple[int, int], list[int]]:
+        """
+        Group the accounts in scope by retention policy.
+
+        Returns:
+            Dict mapping (keep_last_n, keep_days) to account IDs
+        """
+        from backup.models import Account
+
+        accounts = [self.account] if self.account else Account.objects.only("id")
+
+        policy_groups: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for account in accounts:
+            policy_groups[self._get_retention_policy(account)].append(account.id)
+        return policy_groups
+
     def _purge_old_versions(self) -> int:
         """
         Purge file versions beyond retention thresholds.
@@ -126,57 +214,62 @@ class GarbageCollector:
         Returns:
             Number of versions purged
         """
-        from backup.models import Account
-
         total_purged = 0
-        accounts = [self.account] if self.account else Account.objects.all()
 
-        for account in accounts:
-            keep_n, keep_days = self._get_retention_policy(account)
+        # Accounts sharing a retention policy are purged with one query
+        for (keep_n, keep_days), account_ids in self._group_accounts_by_policy().items():
             cutoff_date = timezone.now() - timedelta(days=keep_days)
 
             logger.debug(
-                f"Purging versions for account {account.id}: "
+                f"Purging versions for accounts {account_ids}: "
                 f"keep_n={keep_n}, keep_days={keep_days}"
             )
 
-            # Get all backup items for this account
-            items = BackupItem.objects.filter(sync_root__account=account)
-
-            processed = 0
-            for item in items.iterator():
-                # Get all versions for this item, ordered by captured_at desc
-                versions = list(
-                    FileVersion.objects.filter(backup_item=item)
-                    .order_by("-captured_at")
-                    .values_list("id", "captured_at", flat=False)
+            # Rank each item's versions newest-first in SQL. The cutoff is
+            # applied outside the subquery so every version counts toward keep_n.
+            beyond_keep_n = (
+                FileVersion.objects.filter(account__in=account_ids)
+                .annotate(
+                    row_number=Window(
+                        expression=RowNumber(),
+                        partition_by=F("backup_item_id"),
+                        order_by=F("captured_at").desc(),
+                    )
                 )
+                .filter(row_number__gt=keep_n)
+                .values("id")
+            )
+            versions_to_delete = FileVersion.objects.filter(
+                account__in=account_ids,
+                id__in=beyond_keep_n,
+                captured_at__lt=cutoff_date,
+            )
 
-                if len(versions) <= keep_n:
-                    continue
-
-                # Find versions to delete: beyond keep_n AND older than cutoff
-                versions_to_delete = []
-                for i, (version_id, captured_at) in enumerate(versions):
-                    if i >= keep_n and captured_at < cutoff_date:
-                        versions_to_delete.append(version_id)
-
-                if versions_to_delete:
-                    if self.dry_run:
-                        logger.info(
-                            f"[DRY RUN] Would delete {len(versions_to_delete)} versions "
-                            f"for item {item.id}"
-                        )
-                    else:
-                        FileVersion.objects.filter(id__in=versions_to_delete).delete()
-                        logger.debug(
-                            f"Deleted {len(versions_to_delete)} versions for item {item.id}"
-                        )
-                    total_purged += len(versions_to_delete)
+            if self.dry_run:
+                count = versions_to_delete.count()
+                if count:
+                    logger.info(
+                        f"[DRY RUN] Would delete {count} versions "
+                        f"for accounts {account_ids}"
+                    )
+            else:
+                # Delete in bounded chunks to avoid huge IN lists; removing
+                # old rows never changes the rank of the versions that remain
+                count = 0
+                while True:
+                    ids = list(
+                        versions_to_delete.values_list("id", flat=True)[: self.delete_chunk_size]
+                    )
+                    if not ids:
+                        break
+                    deleted, _ = FileVersion.objects.filter(
+                        account__in=account_ids, id__in=ids
+                    ).delete()
+                    count += deleted
+                if count:
+                    logger.debug(f"Deleted {count} versions for accounts {account_ids}")
 
-                processed += 1
-                if processed % self.batch_size == 0:
-                    logger.debug(f"Processed {processed} items...")
+            total_purged += count
 
         return total_purged
 
@@ -187,20 +280,20 @@ class GarbageCollector:
         Returns:
             Dict with 'count' and 'bytes' freed
         """
-        # Find orphaned blobs
-        orphaned_query = BackupBlob.objects.annotate(
-            version_count=Count("versions")
-        ).filter(version_count=0)
+        # Find orphaned blobs (LEFT JOIN ... IS NULL anti-join, no per-blob count)
+        orphaned_query = BackupBlob.objects.filter(versions__isnull=True)
 
         if self.account:
             orphaned_query = orphaned_query.filter(account=self.account)
 
-        orphaned_blobs = list(orphaned_query.values_list("digest", "size_bytes", "account_id"))
+        orphaned_blobs = list(
+            orphaned_query.values_list("digest", "size_bytes", "account_id", "account__provider")
+        )
 
         if not orphaned_blobs:
             return {"count": 0, "bytes": 0}
 
-        total_bytes = sum(size for _, size, _ in orphaned_blobs)
+        total_bytes = sum(size for _, size, _, _ in orphaned_blobs)
 
         if self.dry_run:
             logger.info(
@@ -209,31 +302,44 @@ class GarbageCollector:
             )
             return {"count": len(orphaned_blobs), "bytes": total_bytes}
 
-        # Delete blobs from storage and database
-        from backup.models import Account
-
-        deleted_count = 0
-        bytes_freed = 0
+        # Group by account so each AccountStorage is built once
+        blobs_by_account: dict[tuple[int, str], list[tuple[str, int]]] = defaultdict(list)
+        for digest, size_bytes, account_id, provider in orphaned_blobs:
+            blobs_by_account[(account_id, provider)].append((digest, size_bytes))
 
-        for digest, size_bytes, account_id in orphaned_blobs:
-            try:
-                account = Account.objects.get(id=account_id)
-                storage = AccountStorage(account)
+        # Bytes freed on disk per blob whose file was removed (0 if already gone)
+        freed_by_digest: dict[str, int] = {}
 
-                # Delete from filesystem
-                if storage.delete_blob(digest):
-                    bytes_freed += size_bytes
+        for (account_id, provider), account_blobs in blobs_by_account.items():
+            storage = self._get_storage(account_id, provider)
 
-                # Delete from database
-                BackupBlob.objects.filter(digest=digest).delete()
-                deleted_count += 1
+            for digest, size_bytes in account_blobs:
+                try:
+                    # Delete from filesystem
+                    freed_by_digest[digest] = size_bytes if storage.delete_blob(digest) else 0
+                    logger.debug(f"Deleted orphaned blob: {digest[:20]}...")
 
-                logger.debug(f"Deleted orphaned blob: {digest[:20]}...")
+                except Exception as e:
+                    logger.warning(f"Failed to delete blob {digest}: {e}")
 
-            except Exception as e:
-                logger.warning(f"Failed to delete blob {digest}: {e}")
+        # Delete from database in bounded chunks so the IN list stays within
+        # parameter limits. Re-check for versions in case sync reused a blob,
+        # and only count the rows that were actually deleted.
+        deleted_digests = list(freed_by_digest)
+        blobs_deleted = 0
+        bytes_freed = 0
+        for start in range(0, len(deleted_digests), self.delete_chunk_size):
+            chunk = deleted_digests[start : start + self.delete_chunk_size]
+            BackupBlob.objects.filter(digest__in=chunk, versions__isnull=True).delete()
+            kept = set(
+                BackupBlob.objects.filter(digest__in=chunk).values_list("digest", flat=True)
+            )
+            for digest in chunk:
+                if digest not in kept:
+                    blobs_deleted += 1
+                    bytes_freed += freed_by_digest[digest]
 
-        return {"count": deleted_count, "bytes": bytes_freed}
+        return {"count": blobs_deleted, "bytes": bytes_freed}
 
     def _purge_quarantined_items(self) -> int:
         """
@@ -245,7 +351,7 @@ class GarbageCollector:
         from backup.models import Account
 
         total_purged = 0
-        accounts = [self.account] if self.account else Account.objects.all()
+        accounts = [self.account] if self.account else Account.objects.only("id", "provider")
 
         for account in accounts:
             _, keep_days = self._get_retention_policy(account)
@@ -258,34 +364,65 @@ class GarbageCollector:
                 state_changed_at__lt=cutoff_date,
             )
 
-            count = quarantined_items.count()
-
-            if count > 0:
-                if self.dry_run:
+            if self.dry_run:
+                count = quarantined_items.count()
+                if count > 0:
                     logger.info(
                         f"[DRY RUN] Would purge {count} quarantined items "
                         f"for account {account.id}"
                     )
-                else:
-                    # Delete archive files
-                    storage = AccountStorage(account)
-                    for item in quarantined_items.iterator():
+            else:
+                count = self._purge_quarantined_batches(account, quarantined_items)
+                if count > 0:
+                    logger.info(f"Purged {count} quarantined items for account {account.id}")
+
+            total_purged += count
+
+        return total_purged
+
+    def _purge_quarantined_batches(self, account: Account, quarantined_items) -> int:
+        """
+        Delete archive files and mark items PURGED, one locked batch at a time.
+
+        Rows are locked with SKIP LOCKED so overlapping GC runs partition the
+        work instead of unlinking the same files twice.
+
+        Returns:
+            Number of items purged
+        """
+        storage = self._get_storage(account.id, account.provider)
+        purged = 0
+
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    quarantined_items.select_for_update(skip_locked=True, of=("self",))
+                    .values_list("id", "path")[: self.delete_chunk_size]
+                )
+                if not batch:
+                    break
+
+                # Delete archive files (I/O bound, so unlink in parallel)
+                with ThreadPoolExecutor(max_workers=self.delete_workers) as executor:
+                    futures = {
+                        executor.submit(
+                            (storage.archive_dir / path).unlink, missing_ok=True
+                        ): path
+                        for _, path in batch
+                    }
+                    for future in as_completed(futures):
                         try:
-                            archive_path = storage.archive_dir / item.path
-                            if archive_path.exists():
-                                archive_path.unlink()
+                            future.result()
                         except Exception as e:
                             logger.warning(
-                                f"Failed to delete archive file {item.path}: {e}"
+                                f"Failed to delete archive file {futures[future]}: {e}"
                             )
 
-                    # Update state to PURGED
-                    quarantined_items.update(
-                        state=ItemState.PURGED,
-                        state_changed_at=timezone.now(),
-                    )
-                    logger.info(f"Purged {count} quarantined items for account {account.id}")
-
-                total_purged += count
+                # Update state to PURGED
+                BackupItem.objects.filter(id__in=[item_id for item_id, _ in batch]).update(
+                    state=ItemState.PURGED,
+                    state_changed_at=timezone.now(),
+                )
+                purged += len(batch)
 
-        return total_purged
+        return purged
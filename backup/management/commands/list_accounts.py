@@ -5,6 +5,7 @@ Django management command to list all accounts and their status.
 from datetime import datetime, timezone
 
 from django.core.management.base import BaseCommand
+from django.db.models import Max, Q
 
 from backup import secrets
 from backup.models import Account
@@ -21,21 +22,31 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        accounts = Account.objects.filter(is_active=True).select_related().order_by("provider", "email")
+        accounts = list(
+            Account.objects.filter(is_active=True)
+            .annotate(
+                last_synced_at=Max(
+                    "sync_roots__last_sync_at", filter=Q(sync_roots__is_enabled=True)
+                )
+            )
+            .order_by("provider", "email")
+        )
 
-        if not accounts.exists():
+        if not accounts:
             self.stdout.write(self.style.WARNING("No accounts found."))
             self.stdout.write("\nRun 'python manage.py discover_accounts' to import from secrets.json")
             return
 
+        # Read the secrets file once for all accounts
+        tokens_by_account = secrets.get_tokens_for_accounts(accounts)
+
         if options["json"]:
-            self._output_json(accounts)
+            self._output_json(accounts, tokens_by_account)
         else:
-            self._output_table(accounts)
+            self._output_table(accounts, tokens_by_account)
 
-    def _get_token_status(self, account: Account) -> tuple[str, str]:
+    def _get_token_status(self, tokens: dict | None) -> tuple[str, str]:
         """Get token status and expiry info."""
-        tokens = secrets.get_tokens(account)
         if not tokens:
             return "missing", ""
 
@@ -54,25 +65,21 @@ class Command(BaseCommand):
         return "valid", expires_at.strftime("%Y-%m-%d %H:%M")
 
     def _get_last_sync(self, account: Account) -> str:
-        """Get last sync time from any sync root."""
-        sync_roots = account.sync_roots.filter(is_enabled=True).order_by("-last_sync_at")
-        if not sync_roots.exists():
-            return "never"
-
-        last_sync = sync_roots.first().last_sync_at
+        """Get last sync time from any enabled sync root."""
+        last_sync = account.last_synced_at
         if not last_sync:
             return "never"
 
         return last_sync.strftime("%Y-%m-%d %H:%M")
 
-    def _output_table(self, accounts):
+    def _output_table(self, accounts: list[Account], tokens_by_account: dict):
         """Output accounts as formatted table."""
         self.stdout.write("\n" + "=" * 80)
         self.stdout.write(f"{'ID':<4} {'Provider':<12} {'Email':<30} {'Tokens':<10} {'Last Sync':<16}")
         self.stdout.write("=" * 80)
 
         for account in accounts:
-            token_status, _ = self._get_token_status(account)
+            token_status, _ = self._get_token_status(tokens_by_account[account.id])
             last_sync = self._get_last_sync(account)
 
             # Style token status
@@ -91,15 +98,15 @@ class Command(BaseCommand):
             )
 
         self.stdout.write("=" * 80)
-        self.stdout.write(f"Total: {accounts.count()} account(s)\n")
+        self.stdout.write(f"Total: {len(accounts)} account(s)\n")
 
-    def _output_json(self, accounts):
+    def _output_json(self, accounts: list[Account], tokens_by_account: dict):
         """Output accounts as JSON."""
         import json
 
         data = []
         for account in accounts:
-            token_status, expires_at = self._get_token_status(account)
+            token_status, expires_at = self._get_token_status(tokens_by_account[account.id])
             data.append({
                 "id": account.id,
                 "provider": account.provider,
@@ -4,7 +4,7 @@ Django management command to sync a cloud storage account.
 
 from django.core.management.base import BaseCommand, CommandError
 
-from backup.models import Account, SyncRoot
+from backup.models import PROVIDER_DISPLAY, Account, SyncRoot
 from backup.providers.google_drive import GoogleDriveClient
 from backup.storage import AccountStorage
 from backup.sync import SyncEngine
@@ -45,7 +45,7 @@ class Command(BaseCommand):
         except Account.DoesNotExist:
             raise CommandError(f"Account {account_id} not found or inactive")
 
-        self.stdout.write(f"Syncing account: {account.name} ({account.get_provider_display()})")
+        self.stdout.write(f"Syncing account: {account.name} ({PROVIDER_DISPLAY.get(account.provider, account.provider)})")
 
         # Get sync roots
         if options["sync_root_id"]:
@@ -62,10 +62,12 @@ class Command(BaseCommand):
                     f"Sync root {options['sync_root_id']} not found or not enabled"
                 )
         else:
-            sync_roots = list(account.sync_roots.filter(is_enabled=True))
+            enabled_roots = account.sync_roots.filter(is_enabled=True)
+            if not enabled_roots.exists():
+                raise CommandError("No enabled sync roots found")
 
-        if not sync_roots:
-            raise CommandError("No enabled sync roots found")
+            # Stream roots so the first sync starts without loading them all
+            sync_roots = enabled_roots.iterator(chunk_size=50)
 
         # Create client and storage
         client = GoogleDriveClient(account)
@@ -73,13 +75,16 @@ class Command(BaseCommand):
 
         # Sync each root
         for sync_root in sync_roots:
+            # Reuse the loaded account so SyncEngine doesn't lazily re-fetch it
+            sync_root.account = account
+
             self.stdout.write(self.style.WARNING(f"\nSyncing: {sync_root.name}"))
 
             # Force initial if requested
             if options["force_initial"]:
                 self.stdout.write("Forcing initial sync (resetting cursor)")
                 sync_root.sync_cursor = ""
-                sync_root.save()
+                sync_root.save(update_fields=["sync_cursor", "updated_at"])
 
             # Create engine
             engine = SyncEngine(
@@ -112,10 +117,12 @@ class Command(BaseCommand):
                             f"\n⚠ Encountered {len(result.errors)} error(s) during sync"
                         )
                     )
-                    for i, error in enumerate(result.errors[:5], 1):
-                        self.stdout.write(f"  {i}. {error}")
+                    lines = [
+                        f"  {i}. {error}" for i, error in enumerate(result.errors[:5], 1)
+                    ]
                     if len(result.errors) > 5:
-                        self.stdout.write(f"  ... and {len(result.errors) - 5} more")
+                        lines.append(f"  ... and {len(result.errors) - 5} more")
+                    self.stdout.write("\n".join(lines))
 
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f"\n✗ Sync failed: {e}"))
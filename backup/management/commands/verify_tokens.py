@@ -2,6 +2,8 @@
 Django management command to verify token validity for accounts.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 from django.core.management.base import BaseCommand
 
 from backup import secrets
@@ -24,6 +26,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Attempt to refresh expired tokens",
         )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=8,
+            help="Number of accounts to verify in parallel (default: 8)",
+        )
 
     def handle(self, *args, **options):
         account_id = options.get("account_id")
@@ -36,7 +44,7 @@ class Command(BaseCommand):
                 self.stderr.write(self.style.ERROR(f"Account {account_id} not found or inactive"))
                 return
         else:
-            accounts = Account.objects.filter(is_active=True).order_by("id")
+            accounts = Account.objects.filter(is_active=True).only("id", "email", "provider").order_by("id")
 
         if not accounts:
             self.stdout.write(self.style.WARNING("No active accounts found."))
@@ -46,8 +54,26 @@ class Command(BaseCommand):
 
         results = {"valid": 0, "refreshed": 0, "failed": 0, "no_tokens": 0}
 
-        for account in accounts:
-            self._verify_account(account, do_refresh, results)
+        # Read the secrets file once for all accounts
+        tokens_by_account = secrets.get_tokens_for_accounts(accounts)
+
+        # Verification is dominated by network latency, so probe accounts
+        # concurrently and report in account order once all have finished
+        max_workers = max(1, min(options["concurrency"], len(accounts)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes = list(
+                executor.map(
+                    lambda account: self._verify_account(
+                        account, tokens_by_account[account.id], do_refresh
+                    ),
+                    accounts,
+                )
+            )
+
+        for status, message in outcomes:
+            self.stdout.write(message)
+            if status:
+                results[status] += 1
 
         # Summary
         self.stdout.write("\n" + "-" * 40)
@@ -58,44 +84,50 @@ class Command(BaseCommand):
             f"No tokens: {results['no_tokens']}"
         )
 
-    def _verify_account(self, account: Account, do_refresh: bool, results: dict):
-        """Verify a single account's tokens."""
+    def _verify_account(
+        self, account: Account, tokens: dict | None, do_refresh: bool
+    ) -> tuple[str | None, str]:
+        """
+        Verify a single account's tokens.
+
+        Args:
+            account: Account to verify
+            tokens: The account's tokens from the secrets file, or None
+            do_refresh: Whether to refresh expiring tokens first
+
+        Returns:
+            Tuple of (results counter key or None, line to print)
+        """
         prefix = f"[{account.id}] {account.email}"
 
         # Check if tokens exist
-        if not secrets.has_tokens(account):
-            self.stdout.write(f"{prefix}: " + self.style.ERROR("NO TOKENS"))
-            results["no_tokens"] += 1
-            return
+        if tokens is None:
+            return "no_tokens", f"{prefix}: " + self.style.ERROR("NO TOKENS")
 
         # Verify by provider
         if account.provider == Provider.GOOGLE_DRIVE:
-            self._verify_google_drive(account, prefix, do_refresh, results)
-        else:
-            self.stdout.write(f"{prefix}: " + self.style.WARNING(f"Unsupported provider: {account.provider}"))
+            return self._verify_google_drive(account, tokens, prefix, do_refresh)
+        return None, f"{prefix}: " + self.style.WARNING(f"Unsupported provider: {account.provider}")
 
-    def _verify_google_drive(self, account: Account, prefix: str, do_refresh: bool, results: dict):
+    def _verify_google_drive(
+        self, account: Account, tokens: dict, prefix: str, do_refresh: bool
+    ) -> tuple[str, str]:
         """Verify Google Drive account tokens."""
-        client = GoogleDriveClient(account)
+        client = GoogleDriveClient(account, tokens=tokens)
 
         try:
             if do_refresh:
                 refreshed = client.refresh_token_if_needed()
                 if refreshed:
-                    self.stdout.write(f"{prefix}: " + self.style.SUCCESS("REFRESHED"))
-                    results["refreshed"] += 1
-                    return
+                    return "refreshed", f"{prefix}: " + self.style.SUCCESS("REFRESHED")
 
             # Try to get user info to verify token works
             user_info = client.get_user_info()
             email = user_info.get("email", "unknown")
-            self.stdout.write(f"{prefix}: " + self.style.SUCCESS(f"VALID (verified as {email})"))
-            results["valid"] += 1
+            return "valid", f"{prefix}: " + self.style.SUCCESS(f"VALID (verified as {email})")
 
         except TokenExpiredError as e:
-            self.stdout.write(f"{prefix}: " + self.style.ERROR(f"EXPIRED - {e}"))
-            results["failed"] += 1
+            return "failed", f"{prefix}: " + self.style.ERROR(f"EXPIRED - {e}")
 
         except Exception as e:
-            self.stdout.write(f"{prefix}: " + self.style.ERROR(f"ERROR - {e}"))
-            results["failed"] += 1
+            return "failed", f"{prefix}: " + self.style.ERROR(f"ERROR - {e}")
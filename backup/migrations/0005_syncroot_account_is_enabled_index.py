@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-15 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backup', '0004_account_sync_scheduling'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='syncroot',
+            index=models.Index(fields=['account', 'is_enabled'], name='backup_sync_account_5faaf6_idx'),
+        ),
+    ]
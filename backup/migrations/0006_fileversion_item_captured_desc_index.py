@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-15 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backup', '0005_syncroot_account_is_enabled_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='fileversion',
+            name='backup_file_backup__2bc831_idx',
+        ),
+        migrations.AddIndex(
+            model_name='fileversion',
+            index=models.Index(fields=['backup_item', '-captured_at'], name='backup_file_backup__ffe259_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-15 22:35
+
+from django.db import connection, migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backup', '0006_fileversion_item_captured_desc_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='fileversion',
+            name='backup_file_backup__ffe259_idx',
+        ),
+        migrations.AddIndex(
+            model_name='fileversion',
+            index=models.Index(
+                fields=['backup_item', '-captured_at'],
+                # Same condition as FileVersion.Meta: INCLUDE only where supported
+                include=('blob', 'reason') if connection.features.supports_covering_indexes else None,
+                name='fv_item_capt_desc_inc',
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-15 22:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backup', '0007_fileversion_covering_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='backupitem',
+            index=models.Index(condition=models.Q(('state', 'quarantined')), fields=['state_changed_at'], name='bi_quar_partial'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import connection, models
 
 
 class Provider(models.TextChoices):
@@ -27,6 +27,11 @@ class VersionReason(models.TextChoices):
     RESTORE_POINT = "restore_point", "Restore Point"
 
 
+# Label lookups for hot paths (__str__, command output) without walking choices
+PROVIDER_DISPLAY = dict(Provider.choices)
+STATE_DISPLAY = dict(ItemState.choices)
+
+
 class Account(models.Model):
     """
     Represents a cloud storage account.
@@ -60,7 +65,7 @@ class Account(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.name} ({self.get_provider_display()})"
+        return f"{self.name} ({PROVIDER_DISPLAY.get(self.provider, self.provider)})"
 
 
 class SyncRoot(models.Model):
@@ -77,11 +82,34 @@ class SyncRoot(models.Model):
 
     class Meta:
         unique_together = [["account", "provider_root_id"]]
+        indexes = [
+            models.Index(fields=["account", "is_enabled"]),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.account})"
 
 
+class BackupItemManager(models.Manager):
+    def upsert_batch(self, items, update_fields):
+        """
+        Insert or update items in one statement, keyed on (sync_root, provider_item_id).
+
+        Args:
+            items: Unsaved BackupItem instances
+            update_fields: Fields to overwrite when the item already exists
+
+        Returns:
+            The list of items passed in
+        """
+        return self.bulk_create(
+            items,
+            update_conflicts=True,
+            unique_fields=["sync_root", "provider_item_id"],
+            update_fields=update_fields,
+        )
+
+
 class BackupItem(models.Model):
     sync_root = models.ForeignKey(
         SyncRoot, on_delete=models.CASCADE, related_name="items"
@@ -110,16 +138,24 @@ class BackupItem(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BackupItemManager()
+
     class Meta:
         unique_together = [["sync_root", "provider_item_id"]]
         indexes = [
             models.Index(fields=["state"]),
             models.Index(fields=["provider_item_id"]),
             models.Index(fields=["sync_root", "state"]),
+            # Quarantine purges only look at the (few) quarantined rows
+            models.Index(
+                fields=["state_changed_at"],
+                condition=models.Q(state=ItemState.QUARANTINED),
+                name="bi_quar_partial",
+            ),
         ]
 
     def __str__(self):
-        return f"{self.name} ({self.get_state_display()})"
+        return f"{self.name} ({STATE_DISPLAY.get(self.state, self.state)})"
 
 
 class BackupBlob(models.Model):
@@ -157,7 +193,17 @@ class FileVersion(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=["backup_item", "captured_at"]),
+            # INCLUDE lets retention queries run index-only on PostgreSQL;
+            # backends without covering indexes (SQLite) get a plain index
+            models.Index(
+                fields=["backup_item", "-captured_at"],
+                include=(
+                    ["blob", "reason"]
+                    if connection.features.supports_covering_indexes
+                    else None
+                ),
+                name="fv_item_capt_desc_inc",
+            ),
             models.Index(fields=["account", "captured_at"]),
         ]
 
@@ -8,18 +8,24 @@ and file download functionality.
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from io import BytesIO
 from typing import TYPE_CHECKING, BinaryIO, Iterator
 
+import requests
 from django.conf import settings
 from django.utils import timezone as dj_timezone
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+from googleapiclient.http import MediaIoBaseDownload, build_http
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 if TYPE_CHECKING:
     from backup.models import Account
@@ -63,6 +69,85 @@ NON_DOWNLOADABLE_TYPES = {
     "application/vnd.google-apps.fusiontable",
 }
 
+# (is_downloadable, is_google_doc, export MIME type, export extension) by MIME type
+_MIME_INFO: dict[str, tuple[bool, bool, str | None, str | None]] = {
+    **{
+        mime: (True, True, export_mime, ext)
+        for mime, (export_mime, ext) in GOOGLE_DOC_TYPES.items()
+    },
+    **{mime: (False, False, None, None) for mime in NON_DOWNLOADABLE_TYPES},
+}
+_DEFAULT_MIME_INFO = (True, False, None, None)
+
+
+# Refresh tokens that expire within this window
+TOKEN_REFRESH_BUFFER = timedelta(minutes=5)
+
+# File fields requested for metadata lookups
+FILE_METADATA_FIELDS = "id,name,mimeType,size,modifiedTime,md5Checksum,sha256Checksum,parents,trashed"
+
+# Files larger than one chunk are downloaded as parallel byte ranges
+RANGED_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+RANGED_DOWNLOAD_WORKERS = 4
+
+
+_thread_local = threading.local()
+
+
+def _get_thread_http():
+    """
+    Get this thread's httplib2 connection pool, shared by all clients on it.
+
+    httplib2 isn't thread-safe, so connections are only reused between
+    clients running on the same thread.
+    """
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = build_http()
+        _thread_local.http = http
+    return http
+
+
+_shared_session: requests.Session | None = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session used for token requests.
+
+    Reusing one keep-alive pool means refreshing tokens for many accounts
+    pays for the TLS handshake with Google once rather than per account.
+
+    Returns:
+        Shared requests.Session with connection pooling and retries
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            session.mount(
+                "https://",
+                HTTPAdapter(
+                    pool_connections=16,
+                    pool_maxsize=32,
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.3,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                    ),
+                ),
+            )
+            _shared_session = session
+        return _shared_session
+
+
+def _as_naive_utc(value: datetime | None) -> datetime | None:
+    """Convert an aware datetime to the naive UTC form google-auth expects."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
 
 class GoogleDriveError(Exception):
     """Base exception for Google Drive operations."""
@@ -82,7 +167,7 @@ class FileNotDownloadableError(GoogleDriveError):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class DriveFile:
     """Represents a file from Google Drive."""
 
@@ -95,13 +180,21 @@ class DriveFile:
     parents: list[str]
     trashed: bool
     etag: str | None = None
+    # Hex SHA-256 of the content; Drive omits it for Google Docs and folders
+    sha256_checksum: str | None = None
+    # _MIME_INFO entry for mime_type, looked up once
+    _mime_info: tuple[bool, bool, str | None, str | None] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._mime_info = _MIME_INFO.get(self.mime_type, _DEFAULT_MIME_INFO)
 
     @classmethod
     def from_api_response(cls, data: dict) -> "DriveFile":
         """Create DriveFile from Google API response."""
-        modified_time = datetime.fromisoformat(
-            data["modifiedTime"].replace("Z", "+00:00")
-        )
+        # fromisoformat accepts the trailing "Z" directly on Python 3.11+
+        modified_time = datetime.fromisoformat(data["modifiedTime"])
         return cls(
             id=data["id"],
             name=data["name"],
@@ -112,6 +205,7 @@ class DriveFile:
             parents=data.get("parents", []),
             trashed=data.get("trashed", False),
             etag=data.get("etag"),
+            sha256_checksum=data.get("sha256Checksum"),
         )
 
     @property
@@ -120,28 +214,24 @@ class DriveFile:
 
     @property
     def is_google_doc(self) -> bool:
-        return self.mime_type in GOOGLE_DOC_TYPES
+        return self._mime_info[1]
 
     @property
     def is_downloadable(self) -> bool:
-        return self.mime_type not in NON_DOWNLOADABLE_TYPES
+        return self._mime_info[0]
 
     @property
     def export_mime_type(self) -> str | None:
         """Return the export MIME type for Google Docs, or None if not a Doc."""
-        if self.mime_type in GOOGLE_DOC_TYPES:
-            return GOOGLE_DOC_TYPES[self.mime_type][0]
-        return None
+        return self._mime_info[2]
 
     @property
     def export_extension(self) -> str | None:
         """Return the file extension for exported Google Docs."""
-        if self.mime_type in GOOGLE_DOC_TYPES:
-            return GOOGLE_DOC_TYPES[self.mime_type][1]
-        return None
+        return self._mime_info[3]
 
 
-@dataclass
+@dataclass(slots=True)
 class DriveChange:
     """Represents a change from the Google Drive Changes API."""
 
@@ -161,9 +251,7 @@ class DriveChange:
             removed=data.get("removed", False),
             file=DriveFile.from_api_response(file_data) if file_data else None,
             change_type=data.get("changeType", "file"),
-            time=datetime.fromisoformat(time_str.replace("Z", "+00:00"))
-            if time_str
-            else None,
+            time=datetime.fromisoformat(time_str) if time_str else None,
         )
 
 
@@ -171,6 +259,9 @@ class DriveChange:
 class ChangesPage:
     """A page of changes from the Changes API."""
 
+    # A list rather than a lazy iterator: pages are parsed on the
+    # iter_all_changes prefetch thread, and the sync engine takes len() and
+    # makes several passes over each batch
     changes: list[DriveChange]
     new_start_page_token: str | None
     next_page_token: str | None
@@ -259,21 +350,28 @@ class GoogleDriveClient:
     and file downloads.
     """
 
-    def __init__(self, account: "Account"):
+    def __init__(self, account: "Account", tokens: dict | None = None):
         """
         Initialize the client with an account.
 
         Args:
             account: Account model instance with stored credentials
+            tokens: Tokens already read from the secrets file (read on demand if None)
         """
         self.account = account
+        self._tokens = tokens
         self._credentials: Credentials | None = None
         self._service = None
+        # Thread that built the service and owns its connection
+        self._service_thread: int | None = None
+        self._service_lock = threading.Lock()
+        # Per-thread connections for requests from other threads
+        self._local = threading.local()
 
     def _get_credentials(self) -> Credentials:
         """Get or create credentials from secrets file."""
         if self._credentials is None:
-            tokens = secrets.get_tokens(self.account)
+            tokens = self._tokens if self._tokens is not None else secrets.get_tokens(self.account)
             if tokens is None:
                 raise TokenExpiredError(
                     f"No tokens found for account {self.account.email}"
@@ -285,7 +383,7 @@ class GoogleDriveClient:
                 token_uri="https://oauth2.googleapis.com/token",
                 client_id=settings.GOOGLE_CLIENT_ID,
                 client_secret=settings.GOOGLE_CLIENT_SECRET,
-                expiry=tokens.get("expires_at"),
+                expiry=_as_naive_utc(tokens.get("expires_at")),
             )
         return self._credentials
 
@@ -301,17 +399,18 @@ class GoogleDriveClient:
         """
         credentials = self._get_credentials()
 
-        # Check if refresh is needed (expired or expiring in next 5 minutes)
+        # Skip the token endpoint unless expired or expiring in next 5 minutes.
+        # google-auth keeps expiry as naive UTC, so compare against naive now.
         if credentials.expiry:
-            buffer = timedelta(minutes=5)
-            if credentials.expiry > datetime.now(timezone.utc) + buffer:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            if credentials.expiry > now + TOKEN_REFRESH_BUFFER:
                 return False
 
         if not credentials.refresh_token:
             raise TokenExpiredError("No refresh token available")
 
         try:
-            credentials.refresh(Request())
+            credentials.refresh(Request(session=get_shared_session()))
 
             # Save new tokens to secrets file
             secrets.set_tokens(
@@ -331,11 +430,41 @@ class GoogleDriveClient:
     def _get_service(self):
         """Get or create the Drive API service."""
         if self._service is None:
-            self.refresh_token_if_needed()
-            credentials = self._get_credentials()
-            self._service = build("drive", "v3", credentials=credentials)
+            # Downloads may run on several threads; build the service once
+            with self._service_lock:
+                if self._service is None:
+                    self.refresh_token_if_needed()
+                    credentials = self._get_credentials()
+                    self._service_thread = threading.get_ident()
+                    self._service = build(
+                        "drive",
+                        "v3",
+                        http=AuthorizedHttp(credentials, http=_get_thread_http()),
+                        cache_discovery=False,
+                    )
         return self._service
 
+    def _build_authorized_http(self) -> AuthorizedHttp:
+        """Create a separate authorized connection for use from another thread."""
+        # httplib2 connections are not thread-safe, so background requests
+        # can't share the service's default one
+        return AuthorizedHttp(self._get_credentials(), http=build_http())
+
+    def _get_request_http(self) -> AuthorizedHttp | None:
+        """
+        Connection for API requests made from the calling thread.
+
+        Returns:
+            None on the thread that built the service (use its connection),
+            otherwise a connection owned by the calling thread
+        """
+        if threading.get_ident() == self._service_thread:
+            return None
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = self._build_authorized_http()
+        return http
+
     def get_about(self) -> dict:
         """
         Get information about the user and their Drive.
@@ -394,6 +523,7 @@ class GoogleDriveClient:
         page_token: str,
         page_size: int = 1000,
         drive_id: str | None = None,
+        http: AuthorizedHttp | None = None,
     ) -> ChangesPage:
         """
         List changes since the given page token.
@@ -402,6 +532,7 @@ class GoogleDriveClient:
             page_token: The page token from previous call or getStartPageToken
             page_size: Number of changes per page (max 1000)
             drive_id: Optional shared drive ID
+            http: Connection to send the request on (default: the service's own)
 
         Returns:
             ChangesPage with changes and next/new tokens
@@ -414,7 +545,7 @@ class GoogleDriveClient:
             "fields": (
                 "nextPageToken,newStartPageToken,"
                 "changes(fileId,removed,changeType,time,"
-                "file(id,name,mimeType,size,modifiedTime,md5Checksum,parents,trashed))"
+                "file(id,name,mimeType,size,modifiedTime,md5Checksum,sha256Checksum,parents,trashed))"
             ),
             "includeItemsFromAllDrives": True,
             "supportsAllDrives": True,
@@ -422,7 +553,7 @@ class GoogleDriveClient:
         if drive_id:
             params["driveId"] = drive_id
 
-        response = service.changes().list(**params).execute()
+        response = service.changes().list(**params).execute(http=http)
 
         changes = [
             DriveChange.from_api_response(c) for c in response.get("changes", [])
@@ -442,6 +573,9 @@ class GoogleDriveClient:
         """
         Iterate through all changes, yielding batches with the latest token.
 
+        The next page is fetched in the background while the caller
+        processes the current one, hiding one API round-trip per page.
+
         Args:
             start_token: The starting page token
             drive_id: Optional shared drive ID
@@ -450,21 +584,31 @@ class GoogleDriveClient:
             Tuple of (list of changes, current_token)
         """
         page_token = start_token
+        page = self.list_changes(page_token, drive_id=drive_id)
+        prefetch_http = None
 
-        while True:
-            page = self.list_changes(page_token, drive_id=drive_id)
-            current_token = page.new_start_page_token or page.next_page_token or page_token
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                current_token = page.new_start_page_token or page.next_page_token or page_token
 
-            if page.changes:
-                yield page.changes, current_token
+                # No next page once a new start token is returned
+                next_token = None if page.new_start_page_token else page.next_page_token
+                next_page = None
+                if next_token:
+                    if prefetch_http is None:
+                        prefetch_http = self._build_authorized_http()
+                    next_page = executor.submit(
+                        self.list_changes, next_token, drive_id=drive_id, http=prefetch_http
+                    )
 
-            if page.new_start_page_token:
-                # No more changes
-                break
-            elif page.next_page_token:
-                page_token = page.next_page_token
-            else:
-                break
+                if page.changes:
+                    yield page.changes, current_token
+
+                if next_page is None:
+                    break
+
+                page_token = next_token
+                page = next_page.result()
 
     def get_file_metadata(self, file_id: str) -> DriveFile:
         """
@@ -481,19 +625,20 @@ class GoogleDriveClient:
             service.files()
             .get(
                 fileId=file_id,
-                fields="id,name,mimeType,size,modifiedTime,md5Checksum,parents,trashed",
+                fields=FILE_METADATA_FIELDS,
                 supportsAllDrives=True,
             )
-            .execute()
+            .execute(http=self._get_request_http())
         )
         return DriveFile.from_api_response(response)
 
-    def download_file(self, file_id: str) -> BytesIO:
+    def download_file(self, file_id: str, *, file_meta: DriveFile | None = None) -> BytesIO:
         """
         Download a file's content.
 
         Args:
             file_id: The Google Drive file ID
+            file_meta: The file's metadata if already known (skips a lookup)
 
         Returns:
             BytesIO object with file contents
@@ -501,46 +646,24 @@ class GoogleDriveClient:
         Raises:
             FileNotDownloadableError: If file type cannot be downloaded
         """
-        service = self._get_service()
-
-        # Get file metadata to check type
-        file_meta = self.get_file_metadata(file_id)
-
-        if not file_meta.is_downloadable:
-            raise FileNotDownloadableError(
-                f"File type {file_meta.mime_type} cannot be downloaded"
-            )
-
         buffer = BytesIO()
-
-        if file_meta.is_google_doc:
-            # Export Google Docs
-            export_mime = file_meta.export_mime_type
-            request = service.files().export_media(fileId=file_id, mimeType=export_mime)
-        else:
-            # Regular file download
-            request = service.files().get_media(fileId=file_id)
-
-        downloader = MediaIoBaseDownload(buffer, request)
-
-        done = False
-        while not done:
-            status, done = downloader.next_chunk()
-            if status:
-                logger.debug(f"Download progress: {int(status.progress() * 100)}%")
-
+        self.download_file_to_stream(file_id, buffer, file_meta=file_meta)
         buffer.seek(0)
         return buffer
 
     def download_file_to_stream(
-        self, file_id: str, stream: BinaryIO
+        self, file_id: str, stream: BinaryIO, *, file_meta: DriveFile | None = None
     ) -> int:
         """
         Download a file's content to a provided stream.
 
+        Safe to call from several threads at once; each thread other than
+        the one that built the service gets its own connection.
+
         Args:
             file_id: The Google Drive file ID
             stream: Writable binary stream
+            file_meta: The file's metadata if already known (skips a lookup)
 
         Returns:
             Number of bytes written
@@ -549,19 +672,37 @@ class GoogleDriveClient:
             FileNotDownloadableError: If file type cannot be downloaded
         """
         service = self._get_service()
-        file_meta = self.get_file_metadata(file_id)
+        http = self._get_request_http()
+        if file_meta is None:
+            file_meta = self.get_file_metadata(file_id)
 
         if not file_meta.is_downloadable:
             raise FileNotDownloadableError(
                 f"File type {file_meta.mime_type} cannot be downloaded"
             )
 
+        if (
+            not file_meta.is_google_doc
+            and file_meta.size
+            and file_meta.size > RANGED_DOWNLOAD_CHUNK_SIZE
+            and stream.seekable()
+        ):
+            return self._download_ranges_to_stream(file_id, file_meta.size, stream)
+
         if file_meta.is_google_doc:
-            export_mime = file_meta.export_mime_type
-            request = service.files().export_media(fileId=file_id, mimeType=export_mime)
-        else:
-            request = service.files().get_media(fileId=file_id)
+            # Exports don't support ranges and are capped at 10 MB, so fetch
+            # them in one request rather than through MediaIoBaseDownload
+            content = (
+                service.files()
+                .export_media(fileId=file_id, mimeType=file_meta.export_mime_type)
+                .execute(http=http)
+            )
+            stream.write(content)
+            return len(content)
 
+        request = service.files().get_media(fileId=file_id)
+        if http is not None:
+            request.http = http
         downloader = MediaIoBaseDownload(stream, request)
 
         done = False
@@ -573,6 +714,53 @@ class GoogleDriveClient:
 
         return bytes_downloaded
 
+    def _download_ranges_to_stream(self, file_id: str, size: int, stream: BinaryIO) -> int:
+        """
+        Download a binary file as concurrent byte-range requests.
+
+        Args:
+            file_id: The Google Drive file ID
+            size: File size in bytes
+            stream: Writable, seekable binary stream
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            GoogleDriveError: If a range comes back short
+        """
+        service = self._get_service()
+        base = stream.tell()
+        write_lock = threading.Lock()
+        local = threading.local()
+
+        def fetch(start: int) -> None:
+            end = min(start + RANGED_DOWNLOAD_CHUNK_SIZE, size) - 1
+
+            # One connection per worker thread (httplib2 is not thread-safe)
+            if not hasattr(local, "http"):
+                local.http = self._build_authorized_http()
+
+            request = service.files().get_media(fileId=file_id)
+            request.headers["Range"] = f"bytes={start}-{end}"
+            content = request.execute(http=local.http)
+
+            if len(content) != end - start + 1:
+                raise GoogleDriveError(
+                    f"Range {start}-{end} of {file_id} returned {len(content)} bytes"
+                )
+
+            with write_lock:
+                stream.seek(base + start)
+                stream.write(content)
+
+        with ThreadPoolExecutor(max_workers=RANGED_DOWNLOAD_WORKERS) as executor:
+            # list() re-raises the first failed range
+            list(executor.map(fetch, range(0, size, RANGED_DOWNLOAD_CHUNK_SIZE)))
+
+        stream.seek(base + size)
+        return size
+
     def list_files_in_folder(
         self,
         folder_id: str = "root",
@@ -588,6 +776,15 @@ class GoogleDriveClient:
         Yields:
             DriveFile objects
         """
+        # The query already excludes trashed files, so don't ask for the flag
+        fields = "id,name,mimeType,size,modifiedTime,md5Checksum,sha256Checksum,parents"
+        for file_data in self._iter_folder_listing(folder_id, page_size, fields):
+            yield DriveFile.from_api_response(file_data)
+
+    def _iter_folder_listing(
+        self, folder_id: str, page_size: int, fields: str
+    ) -> Iterator[dict]:
+        """Yield raw file records for a folder's non-trashed children, page by page."""
         service = self._get_service()
         page_token = None
 
@@ -595,7 +792,7 @@ class GoogleDriveClient:
             params = {
                 "q": f"'{folder_id}' in parents and trashed = false",
                 "pageSize": page_size,
-                "fields": "nextPageToken,files(id,name,mimeType,size,modifiedTime,md5Checksum,parents,trashed)",
+                "fields": f"nextPageToken,files({fields})",
                 "supportsAllDrives": True,
                 "includeItemsFromAllDrives": True,
             }
@@ -604,8 +801,7 @@ class GoogleDriveClient:
 
             response = service.files().list(**params).execute()
 
-            for file_data in response.get("files", []):
-                yield DriveFile.from_api_response(file_data)
+            yield from response.get("files", [])
 
             page_token = response.get("nextPageToken")
             if not page_token:
@@ -7,14 +7,16 @@ This keeps sensitive credentials out of the database entirely.
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import os
 import stat
 import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 from django.conf import settings
 
@@ -23,6 +25,21 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Serializes read-modify-write cycles so concurrent token refreshes in one
+# process (e.g. parallel verify_tokens workers) don't drop each other's updates
+_write_lock = threading.Lock()
+
+# Token updates waiting to be written, keyed by account key. A burst of
+# refreshes queues here while one write is in flight, and the next writer
+# saves all of them at once.
+_pending_tokens: dict[str, dict] = {}
+_pending_lock = threading.Lock()
+
+# Parsed secrets keyed by (path, inode, mtime_ns, size) so unchanged files
+# aren't re-read. Readers must treat the cached dict as read-only.
+_cache: tuple[tuple[str, int, int, int], dict] | None = None
+_cache_lock = threading.Lock()
+
 
 class SecretsError(Exception):
     """Base exception for secrets operations."""
@@ -56,18 +73,54 @@ def _get_account_key(account: "Account") -> str:
     return f"{account.provider}:{account.email}"
 
 
+def _cache_key(path: Path) -> tuple[str, int, int, int] | None:
+    """
+    Identify the current version of the secrets file, or None if missing.
+
+    Includes the inode: a token refresh rewrites JSON of the same size, and
+    two writes within the filesystem's timestamp granularity share an mtime,
+    but each atomic replace creates a new inode.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (str(path), st.st_ino, st.st_mtime_ns, st.st_size)
+
+
 def _load_secrets() -> dict:
     """
     Load secrets from the secrets file.
 
+    The parsed file is cached until its inode, mtime or size changes. The
+    returned dict is shared, so callers that modify it must use
+    _load_secrets_for_update().
+
     Returns:
         Dict of account secrets, empty dict if file doesn't exist
     """
+    global _cache
     path = _get_secrets_path()
 
-    if not path.exists():
-        return {}
+    with _cache_lock:
+        key = _cache_key(path)
+        if key is None:
+            return {}
+        if _cache is not None and _cache[0] == key:
+            return _cache[1]
 
+        data = _read_secrets(path)
+        _cache = (key, data)
+        return data
+
+
+def _load_secrets_for_update() -> dict:
+    """Load a private copy of the secrets that the caller may modify."""
+    return copy.deepcopy(_load_secrets())
+
+
+def _read_secrets(path: Path) -> dict:
+    """Read and parse the secrets file."""
     try:
         with open(path, "r") as f:
             return json.load(f)
@@ -85,9 +138,15 @@ def _save_secrets(data: dict) -> None:
 
     Uses atomic write (temp file + rename) and sets permissions to 600.
     """
+    global _cache
     path = _get_secrets_path()
 
     try:
+        # Serialize up front: json.dump would stream many small writes
+        # through the pure-Python encoder. Writers store only JSON types
+        # (expires_at is already an ISO string), so there's no default=.
+        payload = json.dumps(data, indent=2)
+
         # Ensure parent directory exists
         path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -100,7 +159,7 @@ def _save_secrets(data: dict) -> None:
 
         try:
             with os.fdopen(fd, "w") as f:
-                json.dump(data, f, indent=2, default=str)
+                f.write(payload)
 
             # Set restrictive permissions before rename
             os.chmod(tmp_path, stat.S_IRUSR | stat.S_IWUSR)  # 600
@@ -108,6 +167,10 @@ def _save_secrets(data: dict) -> None:
             # Atomic rename
             os.replace(tmp_path, path)
 
+            # Drop the cache so the next read sees exactly what was written
+            with _cache_lock:
+                _cache = None
+
         except Exception:
             # Clean up temp file on error
             try:
@@ -138,7 +201,30 @@ def get_tokens(account: "Account") -> dict | None:
     if tokens is None:
         return None
 
-    # Parse expires_at back to datetime if present
+    return _parse_tokens(tokens)
+
+
+def get_tokens_for_accounts(accounts: Iterable["Account"]) -> dict[int, dict | None]:
+    """
+    Get tokens for several accounts with a single read of the secrets file.
+
+    Args:
+        accounts: Account instances to look up
+
+    Returns:
+        Dict mapping account ID to its tokens (as returned by get_tokens)
+    """
+    secrets = _load_secrets()
+    result = {}
+    for account in accounts:
+        tokens = secrets.get(_get_account_key(account))
+        result[account.id] = _parse_tokens(tokens) if tokens is not None else None
+    return result
+
+
+def _parse_tokens(tokens: dict) -> dict:
+    """Return a copy of tokens with expires_at parsed back to datetime if present."""
+    tokens = dict(tokens)
     if "expires_at" in tokens and tokens["expires_at"]:
         try:
             tokens["expires_at"] = datetime.fromisoformat(tokens["expires_at"])
@@ -163,19 +249,44 @@ def set_tokens(
         refresh_token: OAuth refresh token
         expires_at: Token expiration datetime
     """
-    secrets = _load_secrets()
     key = _get_account_key(account)
 
-    secrets[key] = {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "expires_at": expires_at.isoformat() if expires_at else None,
-    }
-
-    _save_secrets(secrets)
+    with _pending_lock:
+        _pending_tokens[key] = {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_at": expires_at.isoformat() if expires_at else None,
+        }
+    _flush_pending_tokens()
     logger.info(f"Saved tokens for account {key}")
 
 
+def _flush_pending_tokens() -> None:
+    """
+    Write all queued token updates to the secrets file in one save.
+
+    Returns once the caller's own update is on disk, whether this call
+    wrote it or a concurrent writer already included it in its save.
+    """
+    with _write_lock:
+        with _pending_lock:
+            if not _pending_tokens:
+                return
+            pending = dict(_pending_tokens)
+            _pending_tokens.clear()
+
+        try:
+            secrets = _load_secrets_for_update()
+            secrets.update(pending)
+            _save_secrets(secrets)
+        except Exception:
+            # Requeue anything not superseded so waiting writers retry it
+            with _pending_lock:
+                for key, tokens in pending.items():
+                    _pending_tokens.setdefault(key, tokens)
+            raise
+
+
 def delete_tokens(account: "Account") -> bool:
     """
     Delete tokens for an account.
@@ -186,14 +297,19 @@ def delete_tokens(account: "Account") -> bool:
     Returns:
         True if tokens were deleted, False if not found
     """
-    secrets = _load_secrets()
     key = _get_account_key(account)
 
-    if key not in secrets:
-        return False
+    with _write_lock:
+        # A queued update must not bring the tokens back after deletion
+        with _pending_lock:
+            _pending_tokens.pop(key, None)
 
-    del secrets[key]
-    _save_secrets(secrets)
+        secrets = _load_secrets_for_update()
+        if key not in secrets:
+            return False
+
+        del secrets[key]
+        _save_secrets(secrets)
     logger.info(f"Deleted tokens for account {key}")
     return True
 
@@ -229,7 +345,8 @@ def get_oauth_client_config(provider: str) -> dict | None:
     """
     secrets = _load_secrets()
     oauth_clients = secrets.get("oauth_clients", {})
-    return oauth_clients.get(provider)
+    config = oauth_clients.get(provider)
+    return dict(config) if config is not None else None
 
 
 def set_oauth_client_config(
@@ -247,18 +364,19 @@ def set_oauth_client_config(
         client_secret: OAuth client secret
         redirect_uri: OAuth redirect URI (optional)
     """
-    secrets = _load_secrets()
+    with _write_lock:
+        secrets = _load_secrets_for_update()
 
-    if "oauth_clients" not in secrets:
-        secrets["oauth_clients"] = {}
+        if "oauth_clients" not in secrets:
+            secrets["oauth_clients"] = {}
 
-    secrets["oauth_clients"][provider] = {
-        "client_id": client_id,
-        "client_secret": client_secret,
-    }
+        secrets["oauth_clients"][provider] = {
+            "client_id": client_id,
+            "client_secret": client_secret,
+        }
 
-    if redirect_uri:
-        secrets["oauth_clients"][provider]["redirect_uri"] = redirect_uri
+        if redirect_uri:
+            secrets["oauth_clients"][provider]["redirect_uri"] = redirect_uri
 
-    _save_secrets(secrets)
+        _save_secrets(secrets)
     logger.info(f"Saved OAuth client config for provider {provider}")
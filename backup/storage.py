@@ -11,20 +11,50 @@ Storage layout per account:
 
 from __future__ import annotations
 
+import errno
 import hashlib
+import mmap
 import os
 import shutil
+import stat
+import threading
 import uuid
 from io import BytesIO
 from pathlib import Path
-from typing import TYPE_CHECKING, BinaryIO
+from typing import TYPE_CHECKING, BinaryIO, Iterator
 
 from django.conf import settings
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 if TYPE_CHECKING:
     from .models import Account
 
 
+# Default read size when hashing or copying streams (override with
+# BACKUP_IO_CHUNK_SIZE). Large reads keep the per-call overhead of hashlib
+# and file writes negligible.
+BLOB_IO_CHUNK_SIZE = 1024 * 1024
+
+# ioctl that makes a copy-on-write clone of a file (Btrfs, XFS, bcachefs)
+FICLONE = 0x40049409
+
+# FICLONE errors meaning the filesystem can't clone these files at all
+_NO_REFLINK_ERRNOS = {errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY}
+
+# New blobs' directory entries are flushed to disk at least this often
+BLOB_SYNC_MAX_PENDING = 32
+
+# Opens files untranslated on Windows; no-op elsewhere
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+# Algorithm prefix of every digest string ("sha256:<hex>")
+DIGEST_PREFIX = "sha256:"
+
+
 class DigestError(Exception):
     """Raised when digest verification fails."""
 
@@ -70,13 +100,297 @@ def compute_digest(data: bytes | BinaryIO) -> str:
     Returns:
         Digest string in format "sha256:<hex>"
     """
-    hasher = hashlib.sha256()
     if isinstance(data, bytes):
-        hasher.update(data)
-    else:
-        for chunk in iter(lambda: data.read(65536), b""):
-            hasher.update(chunk)
-    return f"sha256:{hasher.hexdigest()}"
+        return DIGEST_PREFIX + hashlib.sha256(data).hexdigest()
+
+    fd = _regular_file_fd(data)
+    if fd is not None:
+        start = data.tell()
+        hex_value = _hash_mapped(fd, start)
+        if hex_value is not None:
+            data.seek(0, os.SEEK_END)
+            return DIGEST_PREFIX + hex_value
+
+    hasher = hashlib.sha256()
+    for chunk in _read_chunks(data):
+        hasher.update(chunk)
+    return DIGEST_PREFIX + hasher.hexdigest()
+
+
+def _hash_mapped(fd: int, offset: int = 0) -> str | None:
+    """
+    SHA-256 a file from offset to EOF with a single hashlib call over an mmap.
+
+    The whole digest is computed inside OpenSSL without the GIL, with no
+    per-chunk interpreter work.
+
+    Args:
+        fd: Descriptor of a regular file
+        offset: Position to start hashing from
+
+    Returns:
+        Hex digest, or None if the file is larger than BACKUP_MMAP_VERIFY_MAX
+    """
+    size = os.fstat(fd).st_size
+    if size > getattr(settings, "BACKUP_MMAP_VERIFY_MAX", 256 * 1024 * 1024):
+        return None
+    if offset >= size:
+        return hashlib.sha256().hexdigest()
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            return hashlib.sha256(view[offset:]).hexdigest()
+
+
+def _read_chunks(stream: BinaryIO) -> Iterator[bytes | memoryview]:
+    """
+    Yield successive chunks of a stream until EOF.
+
+    Streams that support readinto() are read into one reused buffer, so no
+    new bytes object is allocated per chunk. Each chunk is only valid until
+    the next one is requested.
+    """
+    chunk_size = getattr(settings, "BACKUP_IO_CHUNK_SIZE", BLOB_IO_CHUNK_SIZE)
+    readinto = getattr(stream, "readinto", None)
+    if readinto is None:
+        yield from iter(lambda: stream.read(chunk_size), b"")
+        return
+
+    buffer = memoryview(bytearray(chunk_size))
+    while n := readinto(buffer):
+        yield buffer[:n]
+
+
+def _regular_file_fd(stream: BinaryIO) -> int | None:
+    """Return the descriptor behind a stream if it is a regular file, else None."""
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+    return fd if stat.S_ISREG(os.fstat(fd).st_mode) else None
+
+
+def _kernel_copy(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    """
+    Copy bytes between descriptors without passing them through userspace.
+
+    Tries copy_file_range() and then sendfile(), picking up where the
+    previous method stopped if one isn't supported for these files.
+
+    Args:
+        src_fd: Descriptor to read from (its file position is not used)
+        dst_fd: Descriptor to write to at its current position
+        offset: Position in src_fd to start reading from
+        count: Number of bytes to copy
+
+    Returns:
+        Number of bytes copied; less than count if neither method worked
+        or the source ended early
+    """
+    copied = 0
+    for copy in (
+        lambda n: os.copy_file_range(src_fd, dst_fd, n, offset + copied),
+        lambda n: os.sendfile(dst_fd, src_fd, offset + copied, n),
+    ):
+        try:
+            while copied < count:
+                n = copy(count - copied)
+                if n == 0:
+                    return copied
+                copied += n
+            return copied
+        except (AttributeError, OSError):
+            continue
+    return copied
+
+
+def _iter_files(root: Path) -> Iterator[os.DirEntry]:
+    """
+    Yield the regular files under root, recursively.
+
+    Uses os.scandir so file types come from the directory listing itself
+    rather than a stat() per entry. A missing root yields nothing.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+def _datasync_path(path: Path) -> None:
+    """Flush a file's data to disk (fdatasync where available)."""
+    datasync = getattr(os, "fdatasync", os.fsync)
+    fd = os.open(path, os.O_RDONLY | _O_BINARY)
+    try:
+        datasync(fd)
+    finally:
+        os.close(fd)
+
+
+def _sync_files(paths: list[Path]) -> None:
+    """Flush the directories of already-synced files so their names persist."""
+    for parent in {path.parent for path in paths}:
+        try:
+            fd = os.open(parent, os.O_RDONLY)
+        except FileNotFoundError:
+            continue  # Emptied and removed since
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _drop_cached_pages(paths: list[Path]) -> None:
+    """
+    Drop files' cached pages where the platform allows.
+
+    A large backup would otherwise push other processes' data out of the
+    page cache. Only clean pages are dropped, so the files' data must
+    already be on disk.
+    """
+    fadvise = getattr(os, "posix_fadvise", None)
+    if fadvise is None:
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            continue  # Deleted since it was written
+        try:
+            fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    """
+    Clone source to target without copying data, if the filesystem allows.
+
+    Args:
+        source: Existing file to clone
+        target: Path for the new file (must not exist)
+
+    Returns:
+        True if target was created as a clone, False if this clone failed
+
+    Raises:
+        OSError: If the filesystem doesn't support cloning these files, so
+            callers can stop trying
+    """
+    if fcntl is None:
+        return False
+    try:
+        with open(source, "rb") as src, open(target, "xb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError as e:
+        target.unlink(missing_ok=True)
+        if e.errno in _NO_REFLINK_ERRNOS:
+            raise
+        return False
+    shutil.copystat(source, target)
+    return True
+
+
+def _copy_file(source: Path, target: Path) -> None:
+    """
+    Copy a file with copy_file_range() where possible, keeping its metadata.
+
+    shutil.copy2 already avoids userspace copies via sendfile() on Linux,
+    but copy_file_range() also lets the filesystem do the copy itself
+    (server-side on NFS 4.2/SMB, shared extents on some local filesystems).
+    Falls back to shutil.copy2 when the kernel copy isn't available.
+    """
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        size = os.fstat(src.fileno()).st_size
+        copied = _kernel_copy(src.fileno(), dst.fileno(), 0, size)
+    if copied < size:
+        shutil.copy2(source, target)
+        return
+    shutil.copystat(source, target)
+
+
+def _unlink_readonly(path: Path) -> None:
+    """
+    Delete a read-only file such as a blob.
+
+    POSIX only needs write access to the directory; Windows refuses to
+    delete read-only files, so the file is made writable first there.
+    """
+    try:
+        os.unlink(path)
+    except PermissionError:
+        os.chmod(path, 0o644)
+        os.unlink(path)
+
+
+def _move_replacing(source: Path, target: Path) -> None:
+    """
+    Move a file onto target, replacing any file already there.
+
+    On one filesystem this is a single atomic rename(), so target is never
+    missing. Across filesystems it falls back to unlink plus shutil.move.
+    """
+    try:
+        os.replace(source, target)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        target.unlink(missing_ok=True)
+        shutil.move(str(source), str(target))
+
+
+class HashingWriter:
+    """
+    Wraps a writable file, computing its SHA-256 as content is written.
+
+    Hashing alongside the writes saves a second pass over the content.
+    Writes that don't continue exactly where the last one ended (e.g.
+    byte ranges arriving out of order) make the digest unavailable, and
+    digest() returns None so callers hash the finished file instead.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self._hasher = hashlib.sha256()
+        self._hashed = 0
+        self._pos = file.tell()
+
+    def write(self, data: bytes) -> int:
+        if self._hasher is not None:
+            if self._pos == self._hashed:
+                self._hasher.update(data)
+                self._hashed += len(data)
+            else:
+                self._hasher = None
+        written = self._file.write(data)
+        self._pos += written
+        return written
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        self._pos = self._file.seek(offset, whence)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seekable(self) -> bool:
+        return self._file.seekable()
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def digest(self) -> str | None:
+        """Digest of everything written, or None if it couldn't be tracked."""
+        if self._hasher is None:
+            return None
+        return DIGEST_PREFIX + self._hasher.hexdigest()
 
 
 class VerifyingReader:
@@ -102,7 +416,7 @@ class VerifyingReader:
         if self._verified:
             return
         self._verified = True
-        actual = f"sha256:{self._hasher.hexdigest()}"
+        actual = DIGEST_PREFIX + self._hasher.hexdigest()
         if actual != self._expected_digest:
             raise DigestError(
                 f"Digest mismatch: expected {self._expected_digest}, got {actual}"
@@ -110,9 +424,9 @@ class VerifyingReader:
 
     def close(self) -> None:
         if not self._verified:
-            # Read remaining data to verify
-            while self._file.read(65536):
-                pass
+            # Hash the unread remainder so the whole blob is verified
+            for chunk in _read_chunks(self._file):
+                self._hasher.update(chunk)
             self._verify()
         self._file.close()
 
@@ -133,18 +447,56 @@ class AccountStorage:
 
     def __init__(self, account: Account):
         self.account = account
-        self.root = Path(settings.BACKUP_ROOT) / account.provider / str(account.id)
+        self._init_paths(account.id, account.provider)
+
+    @classmethod
+    def for_account_id(cls, account_id: int, provider: str) -> AccountStorage:
+        """
+        Create storage for an account without loading the Account row.
+
+        The storage layout only depends on the provider and account ID, so
+        callers that already have both (e.g. from a values_list) can skip
+        hydrating a model instance. The resulting storage has account=None.
+        """
+        storage = cls.__new__(cls)
+        storage.account = None
+        storage._init_paths(account_id, provider)
+        return storage
+
+    def _init_paths(self, account_id: int, provider: str) -> None:
+        self.root = Path(settings.BACKUP_ROOT) / provider / str(account_id)
         self.current_dir = self.root / "current"
         self.blobs_dir = self.root / "blobs"
         self.tmp_dir = self.root / "tmp"
         self.archive_dir = self.root / "archive"
+        # Blob paths are built by string formatting (see get_blob_path_str)
+        self._sha256_prefix = f"{self.blobs_dir / 'sha256'}{os.sep}"
+        # Blobs renamed into place whose directory entries aren't synced yet
+        self._unsynced: list[Path] = []
+        # Blobs published since the last flush_pending(), still in the page cache
+        self._published: list[Path] = []
+        self._unsynced_lock = threading.Lock()
+        # Set once ensure_directories() has created the top-level directories
+        self._dirs_ready = False
+        # Shard directories known to exist, so write_blob can skip mkdir
+        self._known_shards: set[Path] = set()
+        # Set once a reflink fails because the filesystem can't clone
+        self._reflink_unsupported = False
 
     def ensure_directories(self) -> None:
-        """Create the account directory structure if it doesn't exist."""
+        """
+        Create the account directory structure if it doesn't exist.
+
+        Only the first call touches the disk; the top-level directories are
+        never removed while the storage is in use.
+        """
+        if self._dirs_ready:
+            return
         self.current_dir.mkdir(parents=True, exist_ok=True)
         self.blobs_dir.mkdir(parents=True, exist_ok=True)
         self.tmp_dir.mkdir(parents=True, exist_ok=True)
         self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self._dirs_ready = True
 
     def get_blob_path(self, digest: str) -> Path:
         """
@@ -153,12 +505,32 @@ class AccountStorage:
         Uses sharding: blobs/sha256/aa/bb/<full_digest>
         where aa and bb are first 2 bytes of the hex digest.
         """
-        algo, hex_value = parse_digest(digest)
-        return self.blobs_dir / algo / hex_value[:2] / hex_value[2:4] / hex_value
+        return Path(self.get_blob_path_str(digest))
+
+    def get_blob_path_str(self, digest: str) -> str:
+        """
+        Compute the filesystem path for a blob as a plain string.
+
+        Cheaper than get_blob_path() for callers that pass the path straight
+        to os functions, since no intermediate Path objects are built.
+        """
+        _, hex_value = parse_digest(digest)
+        return self._shard_path_str(hex_value)
+
+    def _shard_path_str(self, hex_value: str) -> str:
+        """
+        Build a blob path from a SHA-256 hex digest without validating it.
+
+        Only for digests this module just computed; anything from callers or
+        the database goes through parse_digest() first, which also stops a
+        malformed digest from pointing outside blobs/.
+        """
+        sep = os.sep
+        return f"{self._sha256_prefix}{hex_value[:2]}{sep}{hex_value[2:4]}{sep}{hex_value}"
 
     def blob_exists(self, digest: str) -> bool:
         """Check if a blob exists on disk."""
-        return self.get_blob_path(digest).exists()
+        return os.path.exists(self.get_blob_path_str(digest))
 
     def write_blob(
         self, data: bytes | BinaryIO, expected_digest: str | None = None
@@ -184,23 +556,40 @@ class AccountStorage:
         try:
             # Write to temp file while computing digest
             hasher = hashlib.sha256()
-            size = 0
+            src_fd = None if isinstance(data, bytes) else _regular_file_fd(data)
 
-            with open(tmp_path, "wb") as f:
+            # Created read-only so the rename publishes a finished blob with
+            # no chmod afterwards; the open descriptor can still write
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_BINARY, 0o444)
+            with open(fd, "wb") as f:
                 if isinstance(data, bytes):
                     hasher.update(data)
                     f.write(data)
-                    size = len(data)
+                elif src_fd is not None:
+                    # Local file: copy in the kernel, then hash the copy
+                    # from the page cache below
+                    start = data.tell()
+                    count = os.fstat(src_fd).st_size - start
+                    copied = _kernel_copy(src_fd, f.fileno(), start, count)
+                    data.seek(start + copied)
+                    for chunk in _read_chunks(data):
+                        f.write(chunk)
                 else:
-                    for chunk in iter(lambda: data.read(65536), b""):
+                    for chunk in _read_chunks(data):
                         hasher.update(chunk)
                         f.write(chunk)
-                        size += len(chunk)
-                # Ensure data is flushed to disk
                 f.flush()
-                os.fsync(f.fileno())
 
-            digest = f"sha256:{hasher.hexdigest()}"
+            if src_fd is not None:
+                with open(tmp_path, "rb") as f:
+                    hex_value = _hash_mapped(f.fileno())
+                    if hex_value is None:
+                        for chunk in _read_chunks(f):
+                            hasher.update(chunk)
+                        hex_value = hasher.hexdigest()
+            else:
+                hex_value = hasher.hexdigest()
+            digest = DIGEST_PREFIX + hex_value
 
             # Verify if expected digest was provided
             if expected_digest and digest != expected_digest:
@@ -208,23 +597,140 @@ class AccountStorage:
                     f"Digest mismatch: expected {expected_digest}, got {digest}"
                 )
 
-            # Move to final location
-            blob_path = self.get_blob_path(digest)
-            if not blob_path.exists():
-                blob_path.parent.mkdir(parents=True, exist_ok=True)
-                tmp_path.rename(blob_path)
-                # Make blob read-only
-                blob_path.chmod(0o444)
-            else:
-                # Blob already exists, remove temp file
-                tmp_path.unlink()
-
+            self._publish(tmp_path, hex_value)
             return digest
 
         except Exception:
             # Clean up temp file on error
             if tmp_path.exists():
-                tmp_path.unlink()
+                _unlink_readonly(tmp_path)
+            raise
+
+    def write_blob_from_path(
+        self,
+        path: Path,
+        expected_digest: str | None = None,
+        *,
+        digest: str | None = None,
+    ) -> str:
+        """
+        Move a finished file into blob storage without copying it.
+
+        The file must be on the same filesystem as the blobs, e.g. created in
+        tmp_dir. It is consumed: renamed into place, or deleted if the blob
+        already exists or verification fails.
+
+        Args:
+            path: File holding the content
+            expected_digest: Optional expected digest for verification
+            digest: The content's digest if already computed as the file was
+                written (see HashingWriter); skips hashing it again
+
+        Returns:
+            The digest of the content
+
+        Raises:
+            DigestError: If expected_digest doesn't match actual content
+        """
+        self.ensure_directories()
+        path = Path(path)
+
+        try:
+            if digest is not None:
+                _, hex_value = parse_digest(digest)
+            else:
+                with open(path, "rb") as f:
+                    hex_value = _hash_mapped(f.fileno())
+                    if hex_value is None:
+                        hasher = hashlib.sha256()
+                        for chunk in _read_chunks(f):
+                            hasher.update(chunk)
+                        hex_value = hasher.hexdigest()
+                digest = DIGEST_PREFIX + hex_value
+
+            if expected_digest and digest != expected_digest:
+                raise DigestError(
+                    f"Digest mismatch: expected {expected_digest}, got {digest}"
+                )
+
+            os.chmod(path, 0o444)
+            self._publish(path, hex_value)
+            return digest
+
+        except Exception:
+            if path.exists():
+                _unlink_readonly(path)
+            raise
+
+    def _publish(self, tmp_path: Path, hex_value: str) -> None:
+        """
+        Rename a finished, read-only temp file to its blob path.
+
+        The data is synced before the rename, so a crash can't leave a
+        truncated file under a valid digest; only the directory syncs are
+        batched. If the blob already exists, the temp file is deleted instead.
+        """
+        # Always check the disk rather than a cache of known digests: GC in
+        # another process may have removed the blob, and skipping the rename
+        # would then lose the content.
+        blob_path = Path(self._shard_path_str(hex_value))
+        if blob_path.exists():
+            # Blob already exists, remove temp file
+            _unlink_readonly(tmp_path)
+            return
+
+        _datasync_path(tmp_path)
+
+        shard = blob_path.parent
+        if shard not in self._known_shards:
+            shard.mkdir(parents=True, exist_ok=True)
+            self._known_shards.add(shard)
+        try:
+            tmp_path.rename(blob_path)
+        except FileNotFoundError:
+            # The shard was emptied and removed since (e.g. by GC)
+            shard.mkdir(parents=True, exist_ok=True)
+            tmp_path.rename(blob_path)
+
+        # Sync the new directory entries in batches rather than once per blob
+        with self._unsynced_lock:
+            self._unsynced.append(blob_path)
+            self._published.append(blob_path)
+            flush = len(self._unsynced) >= BLOB_SYNC_MAX_PENDING
+        if flush:
+            # Keep the pages: the caller is likely about to materialize the blob
+            self._sync_unsynced()
+
+    def flush_pending(self) -> None:
+        """
+        Make blobs written since the last flush durable.
+
+        write_blob syncs each blob's data but not the directory entry that
+        names it, so a new blob can still vanish in a crash. Callers must
+        flush before recording progress that assumes the blobs survive a
+        crash, such as a sync checkpoint. The blobs' cached pages are dropped
+        too, so flush once they have been materialized.
+        """
+        self._sync_unsynced()
+        with self._unsynced_lock:
+            published = self._published
+            self._published = []
+        _drop_cached_pages(published)
+
+    def _sync_unsynced(self) -> None:
+        """Sync the directory entries of blobs published since the last sync."""
+        with self._unsynced_lock:
+            unsynced = self._unsynced
+            self._unsynced = []
+        if not unsynced:
+            return
+
+        try:
+            _sync_files(unsynced)
+        except Exception:
+            # Keep them queued so the next flush retries
+            with self._unsynced_lock:
+                self._unsynced[:0] = unsynced
             raise
 
     def read_blob(self, digest: str, verify: bool = True) -> BinaryIO:
@@ -233,7 +739,8 @@ class AccountStorage:
 
         Args:
             digest: The digest of the blob to read
-            verify: If True, verify digest while reading
+            verify: If True, verify digest (up front for blobs up to
+                BACKUP_MMAP_VERIFY_MAX bytes, otherwise while reading)
 
         Returns:
             File-like object for reading blob content
@@ -242,13 +749,28 @@ class AccountStorage:
             BlobNotFoundError: If blob doesn't exist
             DigestError: If verification fails (only when verify=True)
         """
-        blob_path = self.get_blob_path(digest)
-        if not blob_path.exists():
-            raise BlobNotFoundError(f"Blob not found: {digest}")
-
-        file = open(blob_path, "rb")
-        if verify:
+        try:
+            file = open(self.get_blob_path_str(digest), "rb")
+        except FileNotFoundError:
+            raise BlobNotFoundError(f"Blob not found: {digest}") from None
+        if not verify:
+            return file
+
+        # Verify up front in one hash call over the mapped file, so reads
+        # don't each pay for a hasher update
+        try:
+            hex_value = _hash_mapped(file.fileno())
+        except BaseException:
+            file.close()
+            raise
+        if hex_value is None:
+            # Too big to map comfortably; verify as the caller reads
             return VerifyingReader(file, digest)
+
+        actual = DIGEST_PREFIX + hex_value
+        if actual != digest:
+            file.close()
+            raise DigestError(f"Digest mismatch: expected {digest}, got {actual}")
         return file
 
     def read_blob_bytes(self, digest: str, verify: bool = True) -> bytes:
@@ -276,20 +798,20 @@ class AccountStorage:
             True if blob was deleted, False if it didn't exist
         """
         blob_path = self.get_blob_path(digest)
-        if blob_path.exists():
-            # Remove read-only protection before deleting
-            blob_path.chmod(0o644)
-            blob_path.unlink()
-            # Clean up empty parent directories
-            self._cleanup_empty_dirs(blob_path.parent)
-            return True
-        return False
+        try:
+            _unlink_readonly(blob_path)
+        except FileNotFoundError:
+            return False
+        # Clean up empty parent directories
+        self._cleanup_empty_dirs(blob_path.parent)
+        return True
 
     def _cleanup_empty_dirs(self, path: Path) -> None:
         """Remove empty directories up to blobs_dir."""
         while path != self.blobs_dir and path.exists():
             try:
                 path.rmdir()
+                self._known_shards.discard(path)
                 path = path.parent
             except OSError:
                 # Directory not empty
@@ -313,6 +835,9 @@ class AccountStorage:
         """
         Copy or hardlink a blob to the current/ tree.
 
+        Filesystems that support reflinks get a copy-on-write clone instead,
+        which costs no data copy (disable with BACKUP_TRY_REFLINK = False).
+
         Args:
             digest: The digest of the blob to materialize
             relative_path: Path relative to current/ directory
@@ -332,17 +857,25 @@ class AccountStorage:
         target_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Remove existing file if present
-        if target_path.exists():
-            target_path.unlink()
+        target_path.unlink(missing_ok=True)
+
+        # A reflink is an independent file that shares the blob's extents
+        if getattr(settings, "BACKUP_TRY_REFLINK", True) and not self._reflink_unsupported:
+            try:
+                if _reflink(blob_path, target_path):
+                    return target_path
+            except OSError:
+                # Don't pay for the failing probe on every later file
+                self._reflink_unsupported = True
 
         if use_hardlink:
             try:
                 os.link(blob_path, target_path)
             except OSError:
                 # Fallback to copy if hardlink fails (cross-filesystem)
-                shutil.copy2(blob_path, target_path)
+                _copy_file(blob_path, target_path)
         else:
-            shutil.copy2(blob_path, target_path)
+            _copy_file(blob_path, target_path)
 
         return target_path
 
@@ -357,12 +890,13 @@ class AccountStorage:
             True if file was removed, False if it didn't exist
         """
         target_path = self.current_dir / relative_path
-        if target_path.exists():
+        try:
             target_path.unlink()
-            # Clean up empty parent directories
-            self._cleanup_empty_dirs_to(target_path.parent, self.current_dir)
-            return True
-        return False
+        except FileNotFoundError:
+            return False
+        # Clean up empty parent directories
+        self._cleanup_empty_dirs_to(target_path.parent, self.current_dir)
+        return True
 
     def _cleanup_empty_dirs_to(self, path: Path, stop_at: Path) -> None:
         """Remove empty directories up to stop_at."""
@@ -390,11 +924,7 @@ class AccountStorage:
         target_path = self.archive_dir / relative_path
         target_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Handle existing file in archive
-        if target_path.exists():
-            target_path.unlink()
-
-        shutil.move(str(source_path), str(target_path))
+        _move_replacing(source_path, target_path)
         self._cleanup_empty_dirs_to(source_path.parent, self.current_dir)
         return target_path
 
@@ -415,10 +945,7 @@ class AccountStorage:
         target_path = self.current_dir / relative_path
         target_path.parent.mkdir(parents=True, exist_ok=True)
 
-        if target_path.exists():
-            target_path.unlink()
-
-        shutil.move(str(source_path), str(target_path))
+        _move_replacing(source_path, target_path)
         self._cleanup_empty_dirs_to(source_path.parent, self.archive_dir)
         return target_path
 
@@ -434,17 +961,13 @@ class AccountStorage:
         current_files = 0
 
         # Count blobs
-        if self.blobs_dir.exists():
-            for blob_file in self.blobs_dir.rglob("*"):
-                if blob_file.is_file():
-                    blob_count += 1
-                    total_size += blob_file.stat().st_size
+        for entry in _iter_files(self.blobs_dir):
+            blob_count += 1
+            total_size += entry.stat(follow_symlinks=False).st_size
 
         # Count current files
-        if self.current_dir.exists():
-            for f in self.current_dir.rglob("*"):
-                if f.is_file():
-                    current_files += 1
+        for _ in _iter_files(self.current_dir):
+            current_files += 1
 
         return {
             "blob_count": blob_count,
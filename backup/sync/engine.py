@@ -8,11 +8,16 @@ version tracking, and deletion state transitions per ADR 0001.
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
-from io import BytesIO
+import os
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import TYPE_CHECKING
 
+from django.conf import settings
 from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 
 if TYPE_CHECKING:
@@ -22,6 +27,7 @@ if TYPE_CHECKING:
 
 from backup.models import BackupBlob, BackupItem, FileVersion, ItemState, ItemType, VersionReason
 from backup.providers.google_drive import FileNotDownloadableError
+from backup.storage import DIGEST_PREFIX, HashingWriter
 from backup.sync.exceptions import (
     DownloadError,
     StorageError,
@@ -34,7 +40,7 @@ from backup.sync.path_builder import PathBuilder
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class SyncResult:
     """Result of a sync operation."""
 
@@ -43,11 +49,7 @@ class SyncResult:
     files_deleted: int = 0
     files_quarantined: int = 0
     bytes_downloaded: int = 0
-    errors: list[Exception] = None
-
-    def __post_init__(self):
-        if self.errors is None:
-            self.errors = []
+    errors: list[Exception] = field(default_factory=list)
 
 
 class SyncEngine:
@@ -73,6 +75,10 @@ class SyncEngine:
         self.session: SyncSession | None = None
         self.path_builder = PathBuilder(sync_root)
         self.sync_start_time = None
+        # Events awaiting one bulk insert at the next checkpoint
+        self._pending_events: list[SyncEvent] = []
+        # Downloads started ahead of processing, keyed by provider file ID
+        self._downloads: dict[str, tuple[DriveFile, Future[tuple[str, int]]]] = {}
 
     def run_sync(self) -> SyncResult:
         """
@@ -137,6 +143,12 @@ class SyncEngine:
             return result
 
         except Exception as e:
+            # Keep the audit trail for changes that were committed
+            try:
+                self._flush_events()
+            except Exception as flush_error:
+                logger.warning(f"Failed to save sync events: {flush_error}")
+
             # Mark session failed
             self.session.status = "failed"
             self.session.error_message = str(e)
@@ -243,49 +255,217 @@ class SyncEngine:
             SyncResult for this batch
         """
         result = SyncResult()
+        pending_folders: dict[str, tuple[DriveFile, str]] = {}
+
+        # A parent missing in an earlier batch may exist by now
+        self.path_builder.clear_missing_parents()
+
+        # Look up the batch's existing items in one query. Each preloaded
+        # item is used once; a later change to the same ID (or a folder
+        # queued for upsert) may have altered the row, so re-query then.
+        unused_ids = {change.file_id for change in changes}
+        items = {
+            item.provider_item_id: item
+            for item in BackupItem.objects.filter(
+                sync_root=self.sync_root, provider_item_id__in=unused_ids
+            )
+        }
 
-        for change in changes:
+        executor = self._prefetch_downloads(changes, items)
+        try:
+            for change in changes:
+                events_mark = len(self._pending_events)
+                is_deletion = change.removed or (change.file and change.file.trashed)
+                if is_deletion and pending_folders:
+                    # Deletions read items from the database, so land queued folders first
+                    self._flush_folders(pending_folders, result)
+                    pending_folders = {}
+
+                try:
+                    if not is_deletion and change.file and change.file.is_folder:
+                        # Folders need no download; queue them for one batched upsert.
+                        # The path is built now so children in this batch resolve it.
+                        pending_folders[change.file_id] = (
+                            change.file,
+                            self.path_builder.build_path(change.file),
+                        )
+                        unused_ids.discard(change.file_id)
+                        continue
+
+                    if change.file_id in unused_ids:
+                        unused_ids.discard(change.file_id)
+                        item = items.get(change.file_id)
+                    else:
+                        item = BackupItem.objects.filter(
+                            sync_root=self.sync_root, provider_item_id=change.file_id
+                        ).first()
+
+                    # Each change in its own transaction
+                    with transaction.atomic():
+                        item_result = self._process_file_change(change, item, is_initial)
+
+                        if item_result:
+                            result.files_added += item_result.get("added", 0)
+                            result.files_updated += item_result.get("updated", 0)
+                            result.files_deleted += item_result.get("deleted", 0)
+                            result.bytes_downloaded += item_result.get("bytes", 0)
+
+                except DownloadError as e:
+                    # Log but continue with other files
+                    logger.warning(f"Download failed for {change.file_id}: {e}")
+                    # The change was rolled back, so drop its events
+                    del self._pending_events[events_mark:]
+                    SyncEvent.objects.create(
+                        session=self.session,
+                        event_type="error",
+                        provider_file_id=change.file_id,
+                        message=str(e),
+                    )
+                    result.errors.append(e)
+
+                except Exception as e:
+                    # Unexpected error, log and continue
+                    logger.error(f"Unexpected error processing {change.file_id}: {e}", exc_info=True)
+                    del self._pending_events[events_mark:]
+                    SyncEvent.objects.create(
+                        session=self.session,
+                        event_type="error",
+                        provider_file_id=change.file_id,
+                        message=str(e),
+                    )
+                    result.errors.append(e)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            self._downloads.clear()
+
+        if pending_folders:
+            self._flush_folders(pending_folders, result)
+
+        # Blobs must be on disk before the cursor moves past them
+        self.storage.flush_pending()
+
+        # Save checkpoint
+        self._save_checkpoint(current_token)
+
+        return result
+
+    def _flush_folders(
+        self,
+        pending_folders: dict[str, tuple[DriveFile, str]],
+        result: SyncResult,
+    ) -> None:
+        """
+        Upsert queued folders, falling back to one at a time if the batch fails.
+
+        Args:
+            pending_folders: Queued (folder, path) pairs keyed by provider ID
+            result: SyncResult to accumulate statistics and errors into
+        """
+        folders = list(pending_folders.values())
+
+        events_mark = len(self._pending_events)
+        try:
+            with transaction.atomic():
+                stats = self._upsert_folders(folders)
+            result.files_added += stats["added"]
+            result.files_updated += stats["updated"]
+            return
+        except Exception as e:
+            logger.warning(f"Batched upsert of {len(folders)} folders failed: {e}")
+            del self._pending_events[events_mark:]
+
+        for drive_file, _ in folders:
+            events_mark = len(self._pending_events)
             try:
-                # Each change in its own transaction
                 with transaction.atomic():
-                    item_result = self._process_file_change(change, is_initial)
-
-                    if item_result:
-                        result.files_added += item_result.get("added", 0)
-                        result.files_updated += item_result.get("updated", 0)
-                        result.files_deleted += item_result.get("deleted", 0)
-                        result.bytes_downloaded += item_result.get("bytes", 0)
+                    item_result = self._process_folder(drive_file)
+                result.files_added += item_result.get("added", 0)
+                result.files_updated += item_result.get("updated", 0)
 
-            except DownloadError as e:
-                # Log but continue with other files
-                logger.warning(f"Download failed for {change.file_id}: {e}")
+            except Exception as e:
+                logger.error(f"Unexpected error processing {drive_file.id}: {e}", exc_info=True)
+                del self._pending_events[events_mark:]
                 SyncEvent.objects.create(
                     session=self.session,
                     event_type="error",
-                    provider_file_id=change.file_id,
+                    provider_file_id=drive_file.id,
                     message=str(e),
                 )
                 result.errors.append(e)
 
-            except Exception as e:
-                # Unexpected error, log and continue
-                logger.error(f"Unexpected error processing {change.file_id}: {e}", exc_info=True)
-                SyncEvent.objects.create(
-                    session=self.session,
-                    event_type="error",
-                    provider_file_id=change.file_id,
-                    message=str(e),
+    def _upsert_folders(self, folders: list[tuple[DriveFile, str]]) -> dict:
+        """
+        Create or update folder BackupItems in a single statement.
+
+        Args:
+            folders: (folder, path) pairs to upsert
+
+        Returns:
+            Statistics dictionary with 'added' and 'updated' counts
+        """
+        folder_ids = [drive_file.id for drive_file, _ in folders]
+        existing_ids = set(
+            BackupItem.objects.filter(
+                sync_root=self.sync_root, provider_item_id__in=folder_ids
+            ).values_list("provider_item_id", flat=True)
+        )
+
+        BackupItem.objects.upsert_batch(
+            [
+                BackupItem(
+                    sync_root=self.sync_root,
+                    provider_item_id=drive_file.id,
+                    name=drive_file.name,
+                    path=path,
+                    item_type=ItemType.FOLDER,
+                    mime_type=drive_file.mime_type,
+                    provider_modified_at=drive_file.modified_time,
+                    state=ItemState.ACTIVE,
+                    last_seen_at=self.sync_start_time,
                 )
-                result.errors.append(e)
+                for drive_file, path in folders
+            ],
+            update_fields=[
+                "name",
+                "path",
+                "item_type",
+                "mime_type",
+                "provider_modified_at",
+                "state",
+                "last_seen_at",
+                "updated_at",
+            ],
+        )
 
-        # Save checkpoint
-        self._save_checkpoint(current_token)
+        # Create folders on filesystem
+        for _, path in folders:
+            self.storage.get_current_path(path).mkdir(parents=True, exist_ok=True)
 
-        return result
+        created = [(f, path) for f, path in folders if f.id not in existing_ids]
+        if created:
+            item_ids = dict(
+                BackupItem.objects.filter(
+                    sync_root=self.sync_root,
+                    provider_item_id__in=[f.id for f, _ in created],
+                ).values_list("provider_item_id", "id")
+            )
+            for drive_file, path in created:
+                self._record_event(
+                    event_type="file_added",
+                    backup_item_id=item_ids[drive_file.id],
+                    provider_file_id=drive_file.id,
+                    file_path=path,
+                    message=f"Folder created: {drive_file.name}",
+                )
+
+        logger.debug(f"Upserted {len(folders)} folders ({len(created)} created)")
+        return {"added": len(created), "updated": len(folders) - len(created)}
 
     def _process_file_change(
         self,
         change: DriveChange,
+        item: BackupItem | None,
         is_initial: bool = False,
     ) -> dict | None:
         """
@@ -293,6 +473,7 @@ class SyncEngine:
 
         Args:
             change: The change event
+            item: The existing BackupItem for the changed file, if any
             is_initial: Whether this is part of initial sync
 
         Returns:
@@ -300,7 +481,7 @@ class SyncEngine:
         """
         # Handle deletion
         if change.removed or (change.file and change.file.trashed):
-            return self._process_file_deleted(change)
+            return self._process_file_deleted(change, item)
 
         # Handle file addition/update
         if change.file:
@@ -309,7 +490,7 @@ class SyncEngine:
                 return self._process_folder(change.file)
 
             # Process regular file
-            return self._process_file_added_or_updated(change.file, is_initial)
+            return self._process_file_added_or_updated(change.file, item, is_initial)
 
         return None
 
@@ -347,8 +528,7 @@ class SyncEngine:
 
         if created:
             logger.debug(f"Created folder: {path}")
-            SyncEvent.objects.create(
-                session=self.session,
+            self._record_event(
                 event_type="file_added",
                 backup_item=item,
                 provider_file_id=drive_file.id,
@@ -363,6 +543,7 @@ class SyncEngine:
     def _process_file_added_or_updated(
         self,
         drive_file: DriveFile,
+        item: BackupItem | None,
         is_initial: bool = False,
     ) -> dict | None:
         """
@@ -370,6 +551,7 @@ class SyncEngine:
 
         Args:
             drive_file: The file to process
+            item: The existing BackupItem for the file, or None if it's new
             is_initial: Whether this is part of initial sync
 
         Returns:
@@ -378,22 +560,13 @@ class SyncEngine:
         # Build path
         path = self.path_builder.build_path(drive_file)
 
-        # Check if item exists
-        try:
-            item = BackupItem.objects.get(
-                sync_root=self.sync_root,
-                provider_item_id=drive_file.id,
-            )
+        if item is not None:
             is_new = False
 
             # Check if content has changed
-            content_changed = (
-                item.etag != (drive_file.etag or "")
-                or item.provider_modified_at != drive_file.modified_time
-            )
+            content_changed = self._content_changed(item, drive_file)
 
-        except BackupItem.DoesNotExist:
-            item = None
+        else:
             is_new = True
             content_changed = True
 
@@ -430,8 +603,7 @@ class SyncEngine:
             )
 
             logger.info(f"Added file: {path}")
-            SyncEvent.objects.create(
-                session=self.session,
+            self._record_event(
                 event_type="file_added",
                 backup_item=item,
                 provider_file_id=drive_file.id,
@@ -448,19 +620,29 @@ class SyncEngine:
             item.provider_modified_at = drive_file.modified_time
             item.etag = drive_file.etag or ""
             item.last_seen_at = self.sync_start_time
+            update_fields = [
+                "name",
+                "path",
+                "mime_type",
+                "size_bytes",
+                "provider_modified_at",
+                "etag",
+                "last_seen_at",
+                "updated_at",
+            ]
 
             # Reset deletion tracking if file reappears
             if item.state != ItemState.ACTIVE:
                 logger.info(f"File reappeared: {path} (was {item.state})")
                 item.state = ItemState.ACTIVE
                 item.missing_since_sync_count = 0
+                update_fields += ["state", "missing_since_sync_count"]
 
-            item.save()
+            item.save(update_fields=update_fields)
 
             if content_changed:
                 logger.info(f"Updated file: {path}")
-                SyncEvent.objects.create(
-                    session=self.session,
+                self._record_event(
                     event_type="file_updated",
                     backup_item=item,
                     provider_file_id=drive_file.id,
@@ -470,23 +652,19 @@ class SyncEngine:
 
         # Create FileVersion if we downloaded content
         if digest:
-            try:
-                blob = BackupBlob.objects.get(digest=digest)
-                FileVersion.objects.create(
-                    account=self.account,
-                    backup_item=item,
-                    blob=blob,
-                    observed_path=path,
-                    etag_or_revision=drive_file.etag,
-                    content_modified_at=drive_file.modified_time,
-                    reason=VersionReason.UPDATE,
-                )
-
-                # Materialize to current/ directory
-                self.storage.materialize_to_current(digest, path)
+            # _download_and_store just ensured the blob row, so reference it by key
+            FileVersion.objects.create(
+                account=self.account,
+                backup_item=item,
+                blob_id=digest,
+                observed_path=path,
+                etag_or_revision=drive_file.etag,
+                content_modified_at=drive_file.modified_time,
+                reason=VersionReason.UPDATE,
+            )
 
-            except BackupBlob.DoesNotExist:
-                logger.error(f"Blob {digest} not found after download")
+            # Materialize to current/ directory
+            self.storage.materialize_to_current(digest, path)
 
         if is_new:
             return {"added": 1, "bytes": bytes_downloaded}
@@ -495,32 +673,30 @@ class SyncEngine:
         else:
             return {}
 
-    def _process_file_deleted(self, change: DriveChange) -> dict:
+    def _process_file_deleted(self, change: DriveChange, item: BackupItem | None) -> dict:
         """
         Process an explicit file deletion.
 
         Args:
             change: The deletion change event
+            item: The existing BackupItem for the deleted file, if any
 
         Returns:
             Statistics dictionary
         """
-        try:
-            item = BackupItem.objects.get(
-                sync_root=self.sync_root,
-                provider_item_id=change.file_id,
-            )
-        except BackupItem.DoesNotExist:
+        if item is None:
             # File we never tracked, ignore
             return {}
 
         # Create pre_delete version if we have content
-        if item.item_type == ItemType.FILE and item.versions.exists():
-            latest_version = item.versions.latest("captured_at")
+        latest_version = None
+        if item.item_type == ItemType.FILE:
+            latest_version = item.versions.order_by("-captured_at").first()
+        if latest_version is not None:
             FileVersion.objects.create(
                 account=self.account,
                 backup_item=item,
-                blob=latest_version.blob,
+                blob_id=latest_version.blob_id,
                 observed_path=item.path,
                 etag_or_revision=item.etag,
                 content_modified_at=item.provider_modified_at,
@@ -534,15 +710,18 @@ class SyncEngine:
             except Exception as e:
                 logger.warning(f"Failed to move {item.path} to archive: {e}")
 
+        self.path_builder.forget(item.provider_item_id)
+
         # Update state
         item.state = ItemState.DELETED_UPSTREAM
         item.state_changed_at = timezone.now()
         item.missing_since_sync_count = 0
-        item.save()
+        item.save(
+            update_fields=["state", "state_changed_at", "missing_since_sync_count", "updated_at"]
+        )
 
         logger.info(f"Deleted file: {item.path}")
-        SyncEvent.objects.create(
-            session=self.session,
+        self._record_event(
             event_type="file_deleted",
             backup_item=item,
             provider_file_id=change.file_id,
@@ -552,10 +731,63 @@ class SyncEngine:
 
         return {"deleted": 1}
 
+    @staticmethod
+    def _content_changed(item: BackupItem, drive_file: DriveFile) -> bool:
+        """Whether the provider's file differs from the backed-up item."""
+        return (
+            item.etag != (drive_file.etag or "")
+            or item.provider_modified_at != drive_file.modified_time
+        )
+
+    def _prefetch_downloads(
+        self, changes: list[DriveChange], items: dict[str, BackupItem]
+    ) -> ThreadPoolExecutor | None:
+        """
+        Start downloading a batch's new and changed files on worker threads.
+
+        Downloads are dominated by network round trips, so running them
+        concurrently overlaps the waits. _download_and_store picks up the
+        results; database writes stay on the calling thread.
+
+        Args:
+            changes: The batch's changes
+            items: Existing items for the batch, by provider ID
+
+        Returns:
+            The executor running the downloads (the caller shuts it down),
+            or None if there is too little to download to be worth it
+        """
+        to_fetch: dict[str, DriveFile] = {}
+        for change in changes:
+            drive_file = change.file
+            if (
+                change.removed
+                or drive_file is None
+                or drive_file.trashed
+                or drive_file.is_folder
+                or not drive_file.is_downloadable
+                or change.file_id in to_fetch
+            ):
+                continue
+            item = items.get(change.file_id)
+            if item is None or self._content_changed(item, drive_file):
+                to_fetch[change.file_id] = drive_file
+
+        workers = min(getattr(settings, "BACKUP_DOWNLOAD_WORKERS", 8), len(to_fetch))
+        if workers < 2:
+            return None
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="download")
+        for file_id, drive_file in to_fetch.items():
+            self._downloads[file_id] = (drive_file, executor.submit(self._fetch_blob, drive_file))
+        return executor
+
     def _download_and_store(self, drive_file: DriveFile) -> str:
         """
         Download file content and store as blob.
 
+        Uses the download started by _prefetch_downloads for this file, if any.
+
         Args:
             drive_file: File to download
 
@@ -569,22 +801,19 @@ class SyncEngine:
         if not drive_file.is_downloadable:
             raise DownloadError(f"File type {drive_file.mime_type} cannot be downloaded")
 
+        prefetched_file, future = self._downloads.pop(drive_file.id, (None, None))
         try:
-            # Download file content
-            content = BytesIO()
-            self.client.download_file_to_stream(drive_file.id, content)
-            content.seek(0)
-
-            # Write to blob storage
-            data = content.read()
-            digest = self.storage.write_blob(data)
+            if prefetched_file is drive_file:
+                digest, size = future.result()
+            else:
+                digest, size = self._fetch_blob(drive_file)
 
             # Create or get BackupBlob record
             BackupBlob.objects.get_or_create(
                 digest=digest,
                 defaults={
                     "account": self.account,
-                    "size_bytes": len(data),
+                    "size_bytes": size,
                 },
             )
 
@@ -596,6 +825,46 @@ class SyncEngine:
         except Exception as e:
             raise StorageError(f"Failed to store file: {e}") from e
 
+    def _fetch_blob(self, drive_file: DriveFile) -> tuple[str, int]:
+        """
+        Download file content into blob storage, without touching the database.
+
+        Safe to run on a worker thread.
+
+        Args:
+            drive_file: File to download
+
+        Returns:
+            Tuple of (digest, size in bytes)
+        """
+        expected_digest = None
+        if drive_file.sha256_checksum and drive_file.size is not None:
+            # Drive reported the content's SHA-256, so skip the download
+            # when the blob is already stored (e.g. unchanged content)
+            expected_digest = DIGEST_PREFIX + drive_file.sha256_checksum
+            if self.storage.blob_exists(expected_digest):
+                return expected_digest, drive_file.size
+
+        # Stream to a temp file beside the blobs, so the content is never
+        # held in memory and can be renamed into place without a copy.
+        # It is hashed as it arrives, unless ranges land out of order.
+        self.storage.ensure_directories()
+        fd, name = tempfile.mkstemp(suffix=".tmp", dir=self.storage.tmp_dir)
+        try:
+            with open(fd, "wb") as f:
+                writer = HashingWriter(f)
+                # The change already carries the metadata, so skip the lookup
+                self.client.download_file_to_stream(drive_file.id, writer, file_meta=drive_file)
+            size = os.stat(name).st_size
+        except BaseException:
+            os.unlink(name)
+            raise
+
+        digest = self.storage.write_blob_from_path(
+            Path(name), expected_digest, digest=writer.digest()
+        )
+        return digest, size
+
     def _update_deletion_states(self) -> int:
         """
         Update deletion state machine for files not seen in this sync.
@@ -611,60 +880,77 @@ class SyncEngine:
             state=ItemState.ACTIVE,
             last_seen_at__lt=self.sync_start_time,
         )
+        now = timezone.now()
+
+        # Items missing for the second time in a row cross the threshold.
+        # Load them before the UPDATE below bumps the counters.
+        to_quarantine = list(missing_items.filter(missing_since_sync_count__gte=1))
+
+        # Everything else becomes MISSING_UPSTREAM in one statement
+        missing_count = missing_items.filter(missing_since_sync_count=0).update(
+            state=ItemState.MISSING_UPSTREAM,
+            state_changed_at=now,
+            missing_since_sync_count=F("missing_since_sync_count") + 1,
+            updated_at=now,
+        )
+        logger.debug(f"Marked {missing_count} files missing upstream")
+
+        if to_quarantine:
+            # Newest version of each quarantined file, from a single query
+            latest_blobs = {}
+            for item_id, blob_id in (
+                FileVersion.objects.filter(
+                    backup_item__in=[i for i in to_quarantine if i.item_type == ItemType.FILE]
+                )
+                .order_by("backup_item_id", "-captured_at")
+                .values_list("backup_item_id", "blob_id")
+            ):
+                latest_blobs.setdefault(item_id, blob_id)
+
+            # 1. Create pre_delete FileVersions for files with content
+            FileVersion.objects.bulk_create(
+                FileVersion(
+                    account=self.account,
+                    backup_item=item,
+                    blob_id=latest_blobs[item.id],
+                    observed_path=item.path,
+                    etag_or_revision=item.etag,
+                    content_modified_at=item.provider_modified_at,
+                    reason=VersionReason.PRE_DELETE,
+                )
+                for item in to_quarantine
+                if item.id in latest_blobs
+            )
 
-        quarantined_count = 0
-
-        for item in missing_items:
-            # Increment missing counter
-            item.missing_since_sync_count += 1
-
-            if item.missing_since_sync_count >= 2:
-                # Transition to QUARANTINED
-
-                # 1. Create pre_delete FileVersion if we have content
-                if item.item_type == ItemType.FILE and item.versions.exists():
-                    latest_version = item.versions.latest("captured_at")
-                    FileVersion.objects.create(
-                        account=self.account,
-                        backup_item=item,
-                        blob=latest_version.blob,
-                        observed_path=item.path,
-                        etag_or_revision=item.etag,
-                        content_modified_at=item.provider_modified_at,
-                        reason=VersionReason.PRE_DELETE,
-                    )
-
-                # 2. Move file to archive
+            # 2. Move files to archive
+            for item in to_quarantine:
                 if item.item_type == ItemType.FILE:
                     try:
                         self.storage.move_to_archive(item.path)
                     except Exception as e:
                         logger.warning(f"Failed to move {item.path} to archive: {e}")
+                self.path_builder.forget(item.provider_item_id)
+
+            # 3. Update item states
+            BackupItem.objects.filter(pk__in=[item.id for item in to_quarantine]).update(
+                state=ItemState.QUARANTINED,
+                state_changed_at=now,
+                missing_since_sync_count=F("missing_since_sync_count") + 1,
+                updated_at=now,
+            )
 
-                # 3. Update item state
-                item.state = ItemState.QUARANTINED
-                item.state_changed_at = timezone.now()
-                quarantined_count += 1
-
-                logger.info(
-                    f"Quarantined file: {item.path} (missing for {item.missing_since_sync_count} syncs)"
-                )
-                SyncEvent.objects.create(
-                    session=self.session,
+            for item in to_quarantine:
+                missing_for = item.missing_since_sync_count + 1
+                logger.info(f"Quarantined file: {item.path} (missing for {missing_for} syncs)")
+                self._record_event(
                     event_type="file_quarantined",
                     backup_item=item,
                     file_path=item.path,
-                    message=f"Missing for {item.missing_since_sync_count} consecutive syncs",
+                    message=f"Missing for {missing_for} consecutive syncs",
                 )
 
-            else:
-                # Transition to MISSING_UPSTREAM
-                if item.state == ItemState.ACTIVE:
-                    item.state = ItemState.MISSING_UPSTREAM
-                    item.state_changed_at = timezone.now()
-                    logger.debug(f"File missing: {item.path} (count: {item.missing_since_sync_count})")
-
-            item.save()
+        quarantined_count = len(to_quarantine)
+        self._flush_events()
 
         logger.info(f"Quarantined {quarantined_count} files")
         return quarantined_count
@@ -679,10 +965,26 @@ class SyncEngine:
         self.session.end_cursor = cursor
         self.session.save(update_fields=["end_cursor"])
 
-        SyncEvent.objects.create(
-            session=self.session,
+        self._record_event(
             event_type="checkpoint",
             message=f"Checkpoint: cursor={cursor[:20]}...",
         )
+        self._flush_events()
 
         logger.debug(f"Saved checkpoint: {cursor[:20]}...")
+
+    def _record_event(self, **fields) -> None:
+        """
+        Queue a SyncEvent for this session; it is saved by _flush_events().
+
+        Args:
+            **fields: SyncEvent field values other than session
+        """
+        self._pending_events.append(SyncEvent(session=self.session, **fields))
+
+    def _flush_events(self) -> None:
+        """Save queued SyncEvents with one bulk insert."""
+        if not self._pending_events:
+            return
+        SyncEvent.objects.bulk_create(self._pending_events, batch_size=500)
+        self._pending_events.clear()
@@ -36,6 +36,11 @@ class PathBuilder:
     def __init__(self, sync_root: SyncRoot):
         self.sync_root = sync_root
         self._path_cache: dict[str, str] = {}
+        # Every path assigned in this sync root, so conflict checks stay in memory
+        self._used_paths: set[str] = set()
+        # Parents looked up and not found, so their other children skip the
+        # query. Cleared per batch, as another process may create them.
+        self._missing_parents: set[str] = set()
         self._load_cache()
 
     def _load_cache(self) -> None:
@@ -46,6 +51,7 @@ class PathBuilder:
 
         for item in items:
             self._path_cache[item["provider_item_id"]] = item["path"]
+            self._used_paths.add(item["path"])
 
         logger.debug(f"Loaded {len(self._path_cache)} paths into cache")
 
@@ -67,7 +73,7 @@ class PathBuilder:
         if not drive_file.parents or "root" in drive_file.parents:
             path = self._sanitize_name(drive_file.name)
             path = self._resolve_conflicts(path, drive_file.id)
-            self._path_cache[drive_file.id] = path
+            self._remember(drive_file.id, path)
             return path
 
         # Get parent path
@@ -75,6 +81,8 @@ class PathBuilder:
 
         if parent_id in self._path_cache:
             parent_path = self._path_cache[parent_id]
+        elif parent_id in self._missing_parents:
+            parent_path = f"_pending_/{parent_id}"
         else:
             # Try to fetch parent from database
             try:
@@ -90,15 +98,39 @@ class PathBuilder:
                     f"Parent {parent_id} not found for {drive_file.name}, using temp path"
                 )
                 parent_path = f"_pending_/{parent_id}"
+                self._missing_parents.add(parent_id)
 
         # Build full path
         name = self._sanitize_name(drive_file.name)
         path = f"{parent_path}/{name}"
         path = self._resolve_conflicts(path, drive_file.id)
 
-        self._path_cache[drive_file.id] = path
+        self._remember(drive_file.id, path)
         return path
 
+    def _remember(self, file_id: str, path: str) -> None:
+        """Record a newly assigned path in the cache."""
+        old_path = self._path_cache.get(file_id)
+        if old_path is not None and old_path != path:
+            # The file moved, so its old path is free for others
+            self._used_paths.discard(old_path)
+        self._path_cache[file_id] = path
+        self._used_paths.add(path)
+        self._missing_parents.discard(file_id)
+
+    def forget(self, file_id: str) -> None:
+        """
+        Release the path of an item that left the current/ tree.
+
+        A new file can then take the name without a conflict suffix.
+
+        Args:
+            file_id: Provider file ID of the deleted item
+        """
+        path = self._path_cache.pop(file_id, None)
+        if path is not None:
+            self._used_paths.discard(path)
+
     def _sanitize_name(self, name: str) -> str:
         """
         Remove invalid filesystem characters from a filename.
@@ -138,9 +170,12 @@ class PathBuilder:
         """
         Handle path conflicts by appending a counter.
 
+        Only called for files not yet in the cache, so any path already in
+        use belongs to a different file.
+
         Args:
             path: Proposed path
-            file_id: Provider file ID (to exclude self from conflict check)
+            file_id: Provider file ID (used as a last-resort suffix)
 
         Returns:
             Unique path (possibly with counter appended)
@@ -150,16 +185,7 @@ class PathBuilder:
 
         while True:
             # Check if path is already used by a different file
-            existing = (
-                BackupItem.objects.filter(
-                    sync_root=self.sync_root,
-                    path=path,
-                )
-                .exclude(provider_item_id=file_id)
-                .first()
-            )
-
-            if not existing:
+            if path not in self._used_paths:
                 return path
 
             # Append counter to create unique path
@@ -182,7 +208,13 @@ class PathBuilder:
 
         return path
 
+    def clear_missing_parents(self) -> None:
+        """Look up parents that weren't found again, e.g. at a new batch."""
+        self._missing_parents.clear()
+
     def refresh_cache(self) -> None:
         """Rebuild path cache from database."""
         self._path_cache.clear()
+        self._used_paths.clear()
+        self._missing_parents.clear()
         self._load_cache()
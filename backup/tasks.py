@@ -69,6 +69,10 @@ def sync_account_task(
         logger.info(f"No enabled sync roots for account {account_id}")
         return {"status": "skipped", "reason": "no_sync_roots"}
 
+    # Reuse the loaded account so SyncEngine doesn't lazily re-fetch it per root
+    for sync_root in sync_roots:
+        sync_root.account = account
+
     # Create client and storage
     client = GoogleDriveClient(account)
     storage = AccountStorage(account)
@@ -165,6 +169,10 @@ def run_gc_task(self, account_id: int | None = None):
     logger.info(f"Starting garbage collection (account={account_id})")
 
     gc = GarbageCollector(account=account)
+    if not gc.has_work():
+        logger.info("Garbage collection skipped: nothing to collect")
+        return {"status": "skipped", "reason": "nothing_to_collect"}
+
     result = gc.run()
 
     return {
@@ -193,8 +201,11 @@ def refresh_expiring_tokens(hours_threshold: int = 1):
 
     results = {"refreshed": 0, "failed": 0, "skipped": 0}
 
-    for account in Account.objects.filter(is_active=True):
-        tokens = secrets.get_tokens(account)
+    accounts = list(Account.objects.filter(is_active=True))
+    tokens_by_account = secrets.get_tokens_for_accounts(accounts)
+
+    for account in accounts:
+        tokens = tokens_by_account[account.id]
         if not tokens or not tokens.get("expires_at"):
             results["skipped"] += 1
             continue
@@ -253,11 +264,14 @@ def check_account_health():
     now = timezone.now()
     issues = []
 
-    for account in Account.objects.filter(is_active=True):
+    accounts = list(Account.objects.filter(is_active=True))
+    tokens_by_account = secrets.get_tokens_for_accounts(accounts)
+
+    for account in accounts:
         account_issues = []
 
         # Check token status
-        tokens = secrets.get_tokens(account)
+        tokens = tokens_by_account[account.id]
         if not tokens:
             account_issues.append("missing_tokens")
         elif tokens.get("expires_at") and tokens["expires_at"] < now:
@@ -293,7 +307,7 @@ def check_account_health():
             })
             logger.warning(f"Health issues for {account.email}: {account_issues}")
 
-    checked = Account.objects.filter(is_active=True).count()
+    checked = len(accounts)
     logger.info(f"Health check complete: {checked} accounts checked, {len(issues)} with issues")
 
     return {
@@ -1,14 +1,19 @@
 """Tests for management commands."""
 
+import json
 import tempfile
+from datetime import timedelta
 from io import StringIO
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
 from django.test import TestCase, override_settings
+from django.utils import timezone
 
 from backup import secrets
+from backup.account_discovery import discover_accounts
 from backup.models import Account, Provider, SyncRoot
 
 
@@ -73,6 +78,38 @@ class ListAccountsCommandTests(TestCase):
             self.assertEqual(len(data), 1)
             self.assertEqual(data[0]["email"], "test@example.com")
 
+    def test_list_accounts_last_sync_from_enabled_roots(self):
+        """Test last_sync is the latest sync across enabled roots only."""
+        from datetime import datetime, timezone
+
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            account = Account.objects.create(
+                provider=Provider.GOOGLE_DRIVE,
+                name="Test User",
+                email="test@example.com",
+                is_active=True,
+            )
+            for root_id, synced_at, enabled in [
+                ("never", None, True),
+                ("older", datetime(2024, 1, 1, tzinfo=timezone.utc), True),
+                ("newer", datetime(2024, 2, 1, tzinfo=timezone.utc), True),
+                ("disabled", datetime(2024, 3, 1, tzinfo=timezone.utc), False),
+            ]:
+                SyncRoot.objects.create(
+                    account=account,
+                    provider_root_id=root_id,
+                    name=root_id,
+                    last_sync_at=synced_at,
+                    is_enabled=enabled,
+                )
+
+            out = StringIO()
+            with self.assertNumQueries(1):
+                call_command("list_accounts", "--json", stdout=out)
+            data = json.loads(out.getvalue())
+
+            self.assertEqual(data[0]["last_sync"], "2024-02-01 00:00")
+
 
 class VerifyTokensCommandTests(TestCase):
     def setUp(self):
@@ -133,6 +170,72 @@ class VerifyTokensCommandTests(TestCase):
             call_command("verify_tokens", stdout=out)
             self.assertIn("VALID", out.getvalue())
 
+    @override_settings(SECRETS_FILE=None)
+    @patch("backup.management.commands.verify_tokens.GoogleDriveClient")
+    def test_verify_tokens_multiple_accounts(self, mock_client_class):
+        """Test verify_tokens reports every account in ID order."""
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            accounts = []
+            for i in range(4):
+                account = Account.objects.create(
+                    provider=Provider.GOOGLE_DRIVE,
+                    name=f"User {i}",
+                    email=f"user{i}@example.com",
+                    is_active=True,
+                )
+                if i != 2:
+                    secrets.set_tokens(
+                        account,
+                        access_token=f"access{i}",
+                        refresh_token=f"refresh{i}",
+                    )
+                accounts.append(account)
+
+            mock_client = MagicMock()
+            mock_client.get_user_info.return_value = {"email": "verified@example.com"}
+            mock_client_class.return_value = mock_client
+
+            out = StringIO()
+            call_command("verify_tokens", "--concurrency", "3", stdout=out)
+            output = out.getvalue()
+
+            positions = [output.index(f"[{a.id}] {a.email}") for a in accounts]
+            self.assertEqual(positions, sorted(positions))
+            self.assertIn("Valid: 3", output)
+            self.assertIn("No tokens: 1", output)
+
+    @patch("backup.management.commands.verify_tokens.GoogleDriveClient")
+    def test_verify_tokens_reads_secrets_once(self, mock_client_class):
+        """Test verify_tokens loads the secrets file once for all accounts."""
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            for i in range(3):
+                account = Account.objects.create(
+                    provider=Provider.GOOGLE_DRIVE,
+                    name=f"User {i}",
+                    email=f"user{i}@example.com",
+                    is_active=True,
+                )
+                secrets.set_tokens(
+                    account,
+                    access_token=f"access{i}",
+                    refresh_token=f"refresh{i}",
+                )
+
+            mock_client = MagicMock()
+            mock_client.get_user_info.return_value = {"email": "verified@example.com"}
+            mock_client_class.return_value = mock_client
+
+            with patch("backup.secrets._load_secrets", wraps=secrets._load_secrets) as mock_load:
+                out = StringIO()
+                call_command("verify_tokens", stdout=out)
+
+            self.assertEqual(mock_load.call_count, 1)
+            self.assertIn("Valid: 3", out.getvalue())
+            self.assertEqual(
+                {c.kwargs["tokens"]["refresh_token"] for c in mock_client_class.call_args_list},
+                {"refresh0", "refresh1", "refresh2"},
+            )
+
     @override_settings(SECRETS_FILE=None)
     def test_verify_tokens_specific_account(self):
         """Test verify_tokens for specific account ID."""
@@ -160,6 +263,185 @@ class VerifyTokensCommandTests(TestCase):
             self.assertIn("not found", err.getvalue())
 
 
+class DiscoverAccountsCommandTests(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.secrets_file = Path(self.temp_dir) / ".secrets.json"
+        self.secrets_file.write_text(json.dumps({
+            "oauth_clients": {"google": {"client_id": "id", "client_secret": "secret"}},
+            "google:new@example.com": {"access_token": "a", "refresh_token": "r"},
+            "google_drive:existing@example.com": {"access_token": "a", "refresh_token": "r"},
+            "dropbox:other@example.com": {"access_token": "a", "refresh_token": "r"},
+        }))
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_discover_creates_missing_accounts(self):
+        """Test discover_accounts creates new accounts with a default sync root."""
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            Account.objects.create(
+                provider=Provider.GOOGLE_DRIVE,
+                name="Existing",
+                email="existing@example.com",
+            )
+
+            out = StringIO()
+            call_command("discover_accounts", stdout=out)
+            output = out.getvalue()
+
+            self.assertIn("Created 1 new account(s)", output)
+            self.assertIn("1 existing account(s)", output)
+            self.assertIn("Unknown provider: dropbox", output)
+
+            account = Account.objects.get(email="new@example.com")
+            self.assertEqual(account.provider, Provider.GOOGLE_DRIVE)
+            self.assertTrue(
+                SyncRoot.objects.filter(account=account, provider_root_id="root").exists()
+            )
+
+            # Running again should not create duplicates
+            call_command("discover_accounts", stdout=StringIO())
+            self.assertEqual(Account.objects.count(), 2)
+            self.assertEqual(SyncRoot.objects.filter(account=account).count(), 1)
+
+    def test_discover_reports_concurrent_insert_as_existing(self):
+        """Test an account inserted by another process isn't reported as created."""
+        real_bulk_create = Account.objects.bulk_create
+
+        def bulk_create_after_other_process(objs, **kwargs):
+            other = Account.objects.create(
+                provider=Provider.GOOGLE_DRIVE,
+                name="Other",
+                email="new@example.com",
+            )
+            Account.objects.filter(pk=other.pk).update(
+                created_at=timezone.now() - timedelta(seconds=1)
+            )
+            return real_bulk_create(objs, **kwargs)
+
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            with patch.object(
+                Account.objects, "bulk_create", side_effect=bulk_create_after_other_process
+            ):
+                result = discover_accounts()
+
+            self.assertEqual(result.created_accounts, [("google_drive", "existing@example.com")])
+            self.assertIn(("google_drive", "new@example.com"), result.existing_accounts)
+            self.assertEqual(Account.objects.filter(email="new@example.com").count(), 1)
+
+    def test_discover_falls_back_to_per_account_creation(self):
+        """Test one rejected account doesn't block importing the others."""
+        real_get_or_create = Account.objects.get_or_create
+
+        def reject_existing(**kwargs):
+            if kwargs["email"] == "existing@example.com":
+                raise IntegrityError("bad row")
+            return real_get_or_create(**kwargs)
+
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            with patch.object(
+                Account.objects, "bulk_create", side_effect=IntegrityError("bad row")
+            ), patch.object(Account.objects, "get_or_create", side_effect=reject_existing):
+                result = discover_accounts()
+
+            self.assertEqual(result.created_accounts, [("google_drive", "new@example.com")])
+            self.assertIn(
+                "Failed to create account google_drive / existing@example.com: bad row",
+                result.errors,
+            )
+            account = Account.objects.get(email="new@example.com")
+            self.assertTrue(
+                SyncRoot.objects.filter(account=account, provider_root_id="root").exists()
+            )
+            self.assertFalse(Account.objects.filter(email="existing@example.com").exists())
+
+
+class RunGCCommandTests(TestCase):
+    @patch("backup.management.commands.run_gc._run_gc_for_account")
+    def test_workers_collect_accounts_separately(self, mock_run):
+        """Test --workers runs one collector per account and sums the results."""
+        from backup.gc import GCResult
+
+        for i in range(3):
+            Account.objects.create(
+                provider=Provider.GOOGLE_DRIVE,
+                name=f"Test {i}",
+                email=f"test{i}@example.com",
+            )
+        mock_run.side_effect = lambda account, dry_run, batch_size: GCResult(
+            versions_purged=1, blobs_deleted=2, bytes_freed=100
+        )
+
+        out = StringIO()
+        with patch.object(connection, "vendor", "postgresql"):
+            call_command("run_gc", "--workers", "2", stdout=out)
+        output = out.getvalue()
+
+        self.assertEqual(mock_run.call_count, 3)
+        self.assertIn("Purged 3 old versions", output)
+        self.assertIn("Deleted 6 orphaned blobs", output)
+        self.assertIn("Freed 300 bytes", output)
+
+    def test_workers_rejected_on_sqlite(self):
+        """Test --workers > 1 is refused on SQLite, which allows one writer."""
+        with patch.object(connection, "vendor", "sqlite"):
+            with self.assertRaises(CommandError):
+                call_command("run_gc", "--workers", "2", stdout=StringIO())
+
+    def test_nothing_to_collect(self):
+        """Test run_gc exits early when the probe finds no work."""
+        out = StringIO()
+        with patch("backup.management.commands.run_gc.GarbageCollector.run") as mock_run:
+            call_command("run_gc", stdout=out)
+
+        mock_run.assert_not_called()
+        self.assertIn("Nothing to collect", out.getvalue())
+
+
+class SyncAccountCommandTests(TestCase):
+    @patch("backup.management.commands.sync_account.AccountStorage")
+    @patch("backup.management.commands.sync_account.GoogleDriveClient")
+    @patch("backup.management.commands.sync_account.SyncEngine")
+    def test_force_initial_resets_cursor(self, mock_engine, mock_client, mock_storage):
+        """Test --force-initial clears the stored cursor before syncing."""
+        from backup.sync.engine import SyncResult
+
+        account = Account.objects.create(
+            provider=Provider.GOOGLE_DRIVE,
+            name="Test",
+            email="test@example.com",
+        )
+        sync_root = SyncRoot.objects.create(
+            account=account,
+            provider_root_id="root",
+            name="My Drive",
+            sync_cursor="cursor123",
+        )
+        mock_engine.return_value.run_sync.return_value = SyncResult()
+
+        call_command("sync_account", account.id, "--force-initial", stdout=StringIO())
+
+        sync_root.refresh_from_db()
+        self.assertEqual(sync_root.sync_cursor, "")
+        self.assertEqual(mock_engine.call_args.kwargs["sync_root"].sync_cursor, "")
+
+    def test_no_enabled_sync_roots(self):
+        """Test sync_account fails when the account has no enabled roots."""
+        account = Account.objects.create(
+            provider=Provider.GOOGLE_DRIVE,
+            name="Test",
+            email="test@example.com",
+        )
+        SyncRoot.objects.create(
+            account=account, provider_root_id="root", name="My Drive", is_enabled=False
+        )
+
+        with self.assertRaisesMessage(CommandError, "No enabled sync roots found"):
+            call_command("sync_account", account.id, stdout=StringIO())
+
+
 class AddAccountCommandTests(TestCase):
     @patch("backup.management.commands.add_account.get_authorization_url")
     def test_add_google_account(self, mock_get_url):
@@ -3,8 +3,11 @@
 import tempfile
 from datetime import timedelta
 from pathlib import Path
+from unittest.mock import patch
 
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from backup.gc import GarbageCollector
@@ -204,6 +207,145 @@ class VersionPurgeTests(GCTestCase):
             self.assertEqual(result.versions_purged, 3)
             self.assertEqual(FileVersion.objects.filter(backup_item=item).count(), 2)
 
+    def test_recent_versions_kept_beyond_keep_n(self):
+        """Versions within keep_days survive even when ranked beyond keep_n."""
+        with override_settings(
+            BACKUP_ROOT=self.backup_root,
+            GC_DEFAULT_KEEP_VERSIONS=1,
+            GC_DEFAULT_KEEP_DAYS=30,
+        ):
+            item = BackupItem.objects.create(
+                sync_root=self.sync_root,
+                provider_item_id="file1",
+                name="test.txt",
+                path="test.txt",
+                item_type=ItemType.FILE,
+                state=ItemState.ACTIVE,
+            )
+
+            recent_time = timezone.now() - timedelta(days=5)
+            for i in range(3):
+                blob = self._create_blob(f"recent{i}".encode())
+                version = FileVersion.objects.create(
+                    account=self.account,
+                    backup_item=item,
+                    blob=blob,
+                    observed_path="test.txt",
+                    reason=VersionReason.UPDATE,
+                )
+                FileVersion.objects.filter(pk=version.pk).update(
+                    captured_at=recent_time + timedelta(hours=i)
+                )
+
+            gc = GarbageCollector(account=self.account)
+            result = gc.run()
+
+            self.assertEqual(result.versions_purged, 0)
+            self.assertEqual(FileVersion.objects.filter(backup_item=item).count(), 3)
+
+    def test_keep_n_applied_per_item(self):
+        """keep_last_n should be counted per item, not across the account."""
+        with override_settings(
+            BACKUP_ROOT=self.backup_root,
+            GC_DEFAULT_KEEP_VERSIONS=2,
+            GC_DEFAULT_KEEP_DAYS=30,
+        ):
+            old_time = timezone.now() - timedelta(days=60)
+            items = []
+            for i, version_count in enumerate([1, 2, 4]):
+                item = BackupItem.objects.create(
+                    sync_root=self.sync_root,
+                    provider_item_id=f"file{i}",
+                    name=f"test{i}.txt",
+                    path=f"test{i}.txt",
+                    item_type=ItemType.FILE,
+                    state=ItemState.ACTIVE,
+                )
+                items.append(item)
+                for j in range(version_count):
+                    blob = self._create_blob(f"content{i}_{j}".encode())
+                    version = FileVersion.objects.create(
+                        account=self.account,
+                        backup_item=item,
+                        blob=blob,
+                        observed_path=f"test{i}.txt",
+                        reason=VersionReason.UPDATE,
+                    )
+                    FileVersion.objects.filter(pk=version.pk).update(
+                        captured_at=old_time + timedelta(hours=j)
+                    )
+
+            gc = GarbageCollector(account=self.account)
+            result = gc.run()
+
+            self.assertEqual(result.versions_purged, 2)
+            self.assertEqual(
+                [FileVersion.objects.filter(backup_item=item).count() for item in items],
+                [1, 2, 2],
+            )
+            # The newest versions are the ones retained
+            kept = FileVersion.objects.filter(backup_item=items[2]).order_by("captured_at")
+            self.assertEqual(
+                [v.captured_at for v in kept],
+                [old_time + timedelta(hours=2), old_time + timedelta(hours=3)],
+            )
+
+    def test_retention_policies_loaded_once(self):
+        """Retention policies should be read once per run, not per account/phase."""
+        with override_settings(BACKUP_ROOT=self.backup_root):
+            account2 = Account.objects.create(
+                provider=Provider.GOOGLE_DRIVE,
+                name="Test Account 2",
+                email="test2@example.com",
+                is_active=True,
+            )
+            RetentionPolicy.objects.create(account=account2, keep_last_n=2, keep_days=7)
+
+            gc = GarbageCollector()
+            with CaptureQueriesContext(connection) as ctx:
+                gc.run()
+
+            policy_queries = [
+                q for q in ctx.captured_queries if "backup_retentionpolicy" in q["sql"]
+            ]
+            self.assertEqual(len(policy_queries), 1)
+            self.assertEqual(gc._get_retention_policy(account2), (2, 7))
+
+    def test_version_purge_filters_on_fileversion_account(self):
+        """Version retention should key on FileVersion.account_id without joining items."""
+        with override_settings(BACKUP_ROOT=self.backup_root):
+            gc = GarbageCollector(account=self.account)
+            item = BackupItem.objects.create(
+                sync_root=self.sync_root,
+                provider_item_id="file1",
+                name="test.txt",
+                path="test.txt",
+                item_type=ItemType.FILE,
+            )
+            blob = self._create_blob()
+            old_time = timezone.now() - timedelta(days=60)
+            for _ in range(12):
+                version = FileVersion.objects.create(
+                    account=self.account,
+                    backup_item=item,
+                    blob=blob,
+                    observed_path="test.txt",
+                    reason=VersionReason.UPDATE,
+                )
+                FileVersion.objects.filter(pk=version.pk).update(captured_at=old_time)
+
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(gc._purge_old_versions(), 2)
+
+            version_queries = [
+                q["sql"] for q in ctx.captured_queries if "backup_fileversion" in q["sql"]
+            ]
+            self.assertTrue(version_queries)
+            for sql in version_queries:
+                self.assertIn('"backup_fileversion"."account_id" IN', sql)
+                self.assertNotIn("backup_syncroot", sql)
+                self.assertNotIn("backup_backupitem", sql)
+
 
 class OrphanedBlobTests(GCTestCase):
     """Tests for orphaned blob cleanup."""
@@ -260,6 +402,76 @@ class OrphanedBlobTests(GCTestCase):
             storage = AccountStorage(self.account)
             self.assertTrue(storage.blob_exists(blob.digest))
 
+    def test_orphaned_blobs_deleted_across_accounts(self):
+        """Orphans from every account should be removed in one GC pass."""
+        with override_settings(BACKUP_ROOT=self.backup_root):
+            account2 = Account.objects.create(
+                provider=Provider.GOOGLE_DRIVE,
+                name="Test Account 2",
+                email="test2@example.com",
+                is_active=True,
+            )
+            storage2 = AccountStorage(account2)
+            digest2 = storage2.write_blob(b"orphan two")
+            BackupBlob.objects.create(digest=digest2, account=account2, size_bytes=10)
+            blob1 = self._create_blob(b"orphan one")
+
+            gc = GarbageCollector()
+            result = gc.run()
+
+            self.assertEqual(result.blobs_deleted, 2)
+            self.assertEqual(result.bytes_freed, 20)
+            self.assertFalse(BackupBlob.objects.exists())
+            self.assertFalse(AccountStorage(self.account).blob_exists(blob1.digest))
+            self.assertFalse(storage2.blob_exists(digest2))
+
+    def test_orphaned_blob_rows_deleted_in_chunks(self):
+        """Blob rows should be removed in chunks of GC_DELETE_CHUNK_SIZE."""
+        with override_settings(BACKUP_ROOT=self.backup_root, GC_DELETE_CHUNK_SIZE=2):
+            for i in range(5):
+                self._create_blob(f"orphan {i}".encode())
+
+            with CaptureQueriesContext(connection) as ctx:
+                result = GarbageCollector(account=self.account).run()
+
+            self.assertEqual(result.blobs_deleted, 5)
+            self.assertFalse(BackupBlob.objects.exists())
+            blob_deletes = [
+                q for q in ctx.captured_queries
+                if q["sql"].startswith('DELETE FROM "backup_backupblob"')
+            ]
+            self.assertEqual(len(blob_deletes), 3)
+
+    def test_blob_reused_during_gc_not_counted(self):
+        """A blob a sync references again before its row is deleted is not counted."""
+        with override_settings(BACKUP_ROOT=self.backup_root):
+            blob = self._create_blob(b"reused content")
+            item = BackupItem.objects.create(
+                sync_root=self.sync_root,
+                provider_item_id="file1",
+                name="test.txt",
+                path="test.txt",
+                item_type=ItemType.FILE,
+                state=ItemState.ACTIVE,
+            )
+
+            def reuse_blob(digest):
+                FileVersion.objects.create(
+                    account=self.account,
+                    backup_item=item,
+                    blob=blob,
+                    observed_path="test.txt",
+                    reason=VersionReason.UPDATE,
+                )
+                return True
+
+            with patch.object(AccountStorage, "delete_blob", side_effect=reuse_blob):
+                result = GarbageCollector(account=self.account).run()
+
+            self.assertEqual(result.blobs_deleted, 0)
+            self.assertEqual(result.bytes_freed, 0)
+            self.assertTrue(BackupBlob.objects.filter(digest=blob.digest).exists())
+
 
 class QuarantinePurgeTests(GCTestCase):
     """Tests for quarantined item purging."""
@@ -290,6 +502,50 @@ class QuarantinePurgeTests(GCTestCase):
             item.refresh_from_db()
             self.assertEqual(item.state, ItemState.PURGED)
 
+    def test_quarantined_archive_files_removed(self):
+        """Archive files of purged items should be deleted from disk."""
+        with override_settings(
+            BACKUP_ROOT=self.backup_root,
+            GC_DEFAULT_KEEP_DAYS=30,
+            GC_DELETE_CHUNK_SIZE=2,
+        ):
+            storage = AccountStorage(self.account)
+            old_time = timezone.now() - timedelta(days=60)
+            for i in range(3):
+                path = f"dir/test{i}.txt"
+                archive_path = storage.archive_dir / path
+                archive_path.parent.mkdir(parents=True, exist_ok=True)
+                archive_path.write_bytes(b"archived")
+                item = BackupItem.objects.create(
+                    sync_root=self.sync_root,
+                    provider_item_id=f"file{i}",
+                    name=f"test{i}.txt",
+                    path=path,
+                    item_type=ItemType.FILE,
+                    state=ItemState.QUARANTINED,
+                )
+                BackupItem.objects.filter(pk=item.pk).update(state_changed_at=old_time)
+
+            # An item whose archive file is already gone should not error
+            missing = BackupItem.objects.create(
+                sync_root=self.sync_root,
+                provider_item_id="missing",
+                name="missing.txt",
+                path="missing.txt",
+                item_type=ItemType.FILE,
+                state=ItemState.QUARANTINED,
+            )
+            BackupItem.objects.filter(pk=missing.pk).update(state_changed_at=old_time)
+
+            gc = GarbageCollector(account=self.account)
+            result = gc.run()
+
+            self.assertEqual(result.quarantine_purged, 4)
+            self.assertEqual(list((storage.archive_dir / "dir").iterdir()), [])
+            self.assertFalse(
+                BackupItem.objects.filter(state=ItemState.QUARANTINED).exists()
+            )
+
     def test_recent_quarantined_item_not_purged(self):
         """Quarantined items within keep_days should not be purged."""
         with override_settings(
@@ -382,6 +638,37 @@ class DryRunTests(GCTestCase):
             self.assertEqual(quarantined.state, ItemState.QUARANTINED)
 
 
+class StorageReuseTests(GCTestCase):
+    """Tests for AccountStorage reuse across GC phases."""
+
+    def test_storage_built_once_per_account(self):
+        """Orphan and quarantine phases should share one AccountStorage."""
+        with override_settings(
+            BACKUP_ROOT=self.backup_root,
+            GC_DEFAULT_KEEP_DAYS=30,
+        ):
+            self._create_blob(b"orphan one")
+            self._create_blob(b"orphan two")
+            item = BackupItem.objects.create(
+                sync_root=self.sync_root,
+                provider_item_id="file1",
+                name="test.txt",
+                path="test.txt",
+                item_type=ItemType.FILE,
+                state=ItemState.QUARANTINED,
+            )
+            BackupItem.objects.filter(pk=item.pk).update(
+                state_changed_at=timezone.now() - timedelta(days=60)
+            )
+
+            with patch("backup.gc.AccountStorage", wraps=AccountStorage) as storage_cls:
+                result = GarbageCollector(account=self.account).run()
+
+            self.assertEqual(result.blobs_deleted, 2)
+            self.assertEqual(result.quarantine_purged, 1)
+            self.assertEqual(storage_cls.for_account_id.call_count, 1)
+
+
 class BatchProcessingTests(GCTestCase):
     """Tests for batch processing behavior."""
 
@@ -423,6 +710,42 @@ class BatchProcessingTests(GCTestCase):
             # Should purge 2 versions per item (keep 1, purge 2)
             self.assertEqual(result.versions_purged, 50)  # 25 items * 2 versions
 
+    def test_version_delete_chunked(self):
+        """Version deletes should be split into chunks of GC_DELETE_CHUNK_SIZE."""
+        with override_settings(
+            BACKUP_ROOT=self.backup_root,
+            GC_DEFAULT_KEEP_VERSIONS=1,
+            GC_DEFAULT_KEEP_DAYS=30,
+            GC_DELETE_CHUNK_SIZE=3,
+        ):
+            item = BackupItem.objects.create(
+                sync_root=self.sync_root,
+                provider_item_id="file1",
+                name="test.txt",
+                path="test.txt",
+                item_type=ItemType.FILE,
+                state=ItemState.ACTIVE,
+            )
+            old_time = timezone.now() - timedelta(days=60)
+            for i in range(8):
+                blob = self._create_blob(f"content{i}".encode())
+                version = FileVersion.objects.create(
+                    account=self.account,
+                    backup_item=item,
+                    blob=blob,
+                    observed_path="test.txt",
+                    reason=VersionReason.UPDATE,
+                )
+                FileVersion.objects.filter(pk=version.pk).update(
+                    captured_at=old_time + timedelta(hours=i)
+                )
+
+            result = GarbageCollector(account=self.account).run()
+
+            self.assertEqual(result.versions_purged, 7)
+            remaining = FileVersion.objects.get(backup_item=item)
+            self.assertEqual(remaining.captured_at, old_time + timedelta(hours=7))
+
 
 class MultiAccountTests(GCTestCase):
     """Tests for multi-account GC behavior."""
@@ -586,3 +909,160 @@ class MultiAccountTests(GCTestCase):
 
             # Should purge from both accounts
             self.assertEqual(result.versions_purged, 6)  # 3 from each account
+
+    def test_gc_all_accounts_mixed_policies(self):
+        """Accounts with different policies should each keep their own keep_n."""
+        with override_settings(
+            BACKUP_ROOT=self.backup_root,
+            GC_DEFAULT_KEEP_VERSIONS=3,
+            GC_DEFAULT_KEEP_DAYS=30,
+        ):
+            account2 = Account.objects.create(
+                provider=Provider.GOOGLE_DRIVE,
+                name="Test Account 2",
+                email="test2@example.com",
+                is_active=True,
+            )
+            sync_root2 = SyncRoot.objects.create(
+                account=account2,
+                provider_root_id="root",
+                name="My Drive 2",
+                is_enabled=True,
+            )
+            RetentionPolicy.objects.create(account=account2, keep_last_n=1, keep_days=30)
+
+            old_time = timezone.now() - timedelta(days=60)
+            items = {}
+            for account, sync_root in ((self.account, self.sync_root), (account2, sync_root2)):
+                item = BackupItem.objects.create(
+                    sync_root=sync_root,
+                    provider_item_id="file1",
+                    name="test.txt",
+                    path="test.txt",
+                    item_type=ItemType.FILE,
+                    state=ItemState.ACTIVE,
+                )
+                items[account.id] = item
+                for i in range(5):
+                    blob = BackupBlob.objects.create(
+                        digest=f"sha256:{'d' * 60}{account.id:02d}{i:02d}",
+                        account=account,
+                        size_bytes=100,
+                    )
+                    version = FileVersion.objects.create(
+                        account=account,
+                        backup_item=item,
+                        blob=blob,
+                        observed_path="test.txt",
+                        reason=VersionReason.UPDATE,
+                    )
+                    FileVersion.objects.filter(pk=version.pk).update(
+                        captured_at=old_time + timedelta(hours=i)
+                    )
+
+            result = GarbageCollector().run()
+
+            self.assertEqual(result.versions_purged, 6)  # 2 default + 4 custom
+            self.assertEqual(
+                FileVersion.objects.filter(backup_item=items[self.account.id]).count(), 3
+            )
+            self.assertEqual(
+                FileVersion.objects.filter(backup_item=items[account2.id]).count(), 1
+            )
+
+
+class HasWorkTests(GCTestCase):
+    """Tests for the cheap pre-run probe."""
+
+    def test_no_work_when_idle(self):
+        """Recent versions with live blobs should leave nothing to collect."""
+        with override_settings(BACKUP_ROOT=self.backup_root):
+            item = BackupItem.objects.create(
+                sync_root=self.sync_root,
+                provider_item_id="file1",
+                name="test.txt",
+                path="test.txt",
+                item_type=ItemType.FILE,
+            )
+            FileVersion.objects.create(
+                account=self.account,
+                backup_item=item,
+                blob=self._create_blob(),
+                observed_path="test.txt",
+                reason=VersionReason.UPDATE,
+            )
+
+            self.assertFalse(GarbageCollector(account=self.account).has_work())
+
+    def test_no_work_for_single_old_version(self):
+        """An item's only version is kept however old it is."""
+        with override_settings(BACKUP_ROOT=self.backup_root, GC_DEFAULT_KEEP_DAYS=30):
+            item = BackupItem.objects.create(
+                sync_root=self.sync_root,
+                provider_item_id="file1",
+                name="test.txt",
+                path="test.txt",
+                item_type=ItemType.FILE,
+            )
+            version = FileVersion.objects.create(
+                account=self.account,
+                backup_item=item,
+                blob=self._create_blob(),
+                observed_path="test.txt",
+                reason=VersionReason.UPDATE,
+            )
+            FileVersion.objects.filter(pk=version.pk).update(
+                captured_at=timezone.now() - timedelta(days=365)
+            )
+
+            self.assertFalse(GarbageCollector(account=self.account).has_work())
+
+    def test_work_for_superseded_old_version(self):
+        """An old version with a newer one for the same item should count as work."""
+        with override_settings(
+            BACKUP_ROOT=self.backup_root, GC_DEFAULT_KEEP_DAYS=30, GC_DEFAULT_KEEP_VERSIONS=1
+        ):
+            item = BackupItem.objects.create(
+                sync_root=self.sync_root,
+                provider_item_id="file1",
+                name="test.txt",
+                path="test.txt",
+                item_type=ItemType.FILE,
+            )
+            for i in range(2):
+                version = FileVersion.objects.create(
+                    account=self.account,
+                    backup_item=item,
+                    blob=self._create_blob(f"content{i}".encode()),
+                    observed_path="test.txt",
+                    reason=VersionReason.UPDATE,
+                )
+                FileVersion.objects.filter(pk=version.pk).update(
+                    captured_at=timezone.now() - timedelta(days=365 - i)
+                )
+
+            self.assertTrue(GarbageCollector(account=self.account).has_work())
+
+    def test_work_for_orphaned_blob(self):
+        """An orphaned blob should count as work."""
+        with override_settings(BACKUP_ROOT=self.backup_root):
+            self._create_blob()
+
+            self.assertTrue(GarbageCollector().has_work())
+
+    def test_work_for_old_quarantined_item(self):
+        """A quarantined item past keep_days should count as work."""
+        with override_settings(BACKUP_ROOT=self.backup_root, GC_DEFAULT_KEEP_DAYS=30):
+            item = BackupItem.objects.create(
+                sync_root=self.sync_root,
+                provider_item_id="file1",
+                name="test.txt",
+                path="test.txt",
+                item_type=ItemType.FILE,
+                state=ItemState.QUARANTINED,
+            )
+            BackupItem.objects.filter(pk=item.pk).update(
+                state_changed_at=timezone.now() - timedelta(days=31)
+            )
+
+            self.assertTrue(GarbageCollector(account=self.account).has_work())
@@ -1,7 +1,8 @@
 """Tests for Google Drive provider."""
 
 import tempfile
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -16,6 +17,7 @@ from backup.providers.google_drive import (
     DriveFile,
     FileNotDownloadableError,
     GoogleDriveClient,
+    get_shared_session,
 )
 
 
@@ -39,6 +41,9 @@ class DriveFileTests(TestCase):
         self.assertEqual(file.mime_type, "application/pdf")
         self.assertEqual(file.size, 12345)
         self.assertEqual(file.md5_checksum, "abc123")
+        self.assertEqual(
+            file.modified_time, datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+        )
         self.assertEqual(file.parents, ["folder456"])
         self.assertFalse(file.trashed)
         self.assertFalse(file.is_folder)
@@ -209,6 +214,85 @@ class GoogleDriveClientTests(TestCase):
             self.assertIsNotNone(creds)
             self.assertEqual(creds.token, "test_access_token")
 
+    @patch("backup.providers.google_drive.Credentials.refresh")
+    def test_refresh_skipped_when_token_valid(self, mock_refresh):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(
+                self.account,
+                access_token="test_access_token",
+                refresh_token="test_refresh_token",
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+            )
+
+            client = GoogleDriveClient(self.account)
+
+            self.assertFalse(client.refresh_token_if_needed())
+            mock_refresh.assert_not_called()
+
+    @patch("backup.providers.google_drive.Credentials.refresh")
+    def test_refresh_when_token_expiring(self, mock_refresh):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(
+                self.account,
+                access_token="test_access_token",
+                refresh_token="test_refresh_token",
+                expires_at=datetime.now(timezone.utc) + timedelta(minutes=2),
+            )
+
+            client = GoogleDriveClient(self.account)
+
+            self.assertTrue(client.refresh_token_if_needed())
+            mock_refresh.assert_called_once()
+
+    @patch("backup.providers.google_drive.Credentials.refresh")
+    def test_refresh_uses_shared_session(self, mock_refresh):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(
+                self.account,
+                access_token="test_access_token",
+                refresh_token="test_refresh_token",
+                expires_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+            )
+
+            GoogleDriveClient(self.account).refresh_token_if_needed()
+
+            request = mock_refresh.call_args.args[0]
+            self.assertIs(request.session, get_shared_session())
+            self.assertIs(get_shared_session(), get_shared_session())
+
+    @patch.object(GoogleDriveClient, "refresh_token_if_needed")
+    def test_clients_on_one_thread_share_connections(self, mock_refresh):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            other = Account.objects.create(
+                provider=Provider.GOOGLE_DRIVE,
+                name="Other Account",
+                email="other@example.com",
+            )
+            for account in (self.account, other):
+                secrets.set_tokens(account, access_token="token", refresh_token="refresh")
+
+            first = GoogleDriveClient(self.account)._get_service()
+            second = GoogleDriveClient(other)._get_service()
+
+            first_http = first.files().list().http
+            second_http = second.files().list().http
+            self.assertIsNot(first_http.credentials, second_http.credentials)
+            self.assertIs(first_http.http, second_http.http)
+
+    @patch.object(GoogleDriveClient, "refresh_token_if_needed")
+    def test_other_threads_get_their_own_connection(self, mock_refresh):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(self.account, access_token="token", refresh_token="refresh")
+            client = GoogleDriveClient(self.account)
+            client._get_service()
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                worker_http = executor.submit(client._get_request_http).result()
+
+            self.assertIsNone(client._get_request_http())
+            self.assertIsNotNone(worker_http)
+            self.assertIsNot(worker_http.http, client._service._http.http)
+
     @patch("backup.providers.google_drive.build")
     @patch.object(GoogleDriveClient, "refresh_token_if_needed")
     def test_get_about(self, mock_refresh, mock_build):
@@ -297,6 +381,49 @@ class GoogleDriveClientTests(TestCase):
             self.assertEqual(page.new_start_page_token, "newtoken123")
             self.assertFalse(page.has_more)
 
+    @patch("backup.providers.google_drive.build")
+    @patch.object(GoogleDriveClient, "refresh_token_if_needed")
+    def test_iter_all_changes_prefetches_next_page(self, mock_refresh, mock_build):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(
+                self.account,
+                access_token="test_token",
+                refresh_token="test_refresh",
+            )
+            mock_service = MagicMock()
+            mock_build.return_value = mock_service
+
+            def change(file_id):
+                return {
+                    "fileId": file_id,
+                    "removed": True,
+                    "changeType": "file",
+                    "time": "2024-01-15T10:30:00.000Z",
+                }
+
+            mock_execute = mock_service.changes().list().execute
+            mock_execute.side_effect = [
+                {"changes": [change("file1")], "nextPageToken": "page2"},
+                {"changes": [change("file2")], "nextPageToken": "page3"},
+                {"changes": [change("file3")], "newStartPageToken": "newtoken"},
+            ]
+
+            client = GoogleDriveClient(self.account)
+            batches = [
+                ([c.file_id for c in changes], token)
+                for changes, token in client.iter_all_changes("start")
+            ]
+
+            self.assertEqual(
+                batches,
+                [(["file1"], "page2"), (["file2"], "page3"), (["file3"], "newtoken")],
+            )
+            # Only the first page uses the service's own connection
+            http_args = [c.kwargs["http"] for c in mock_execute.call_args_list]
+            self.assertIsNone(http_args[0])
+            self.assertIsNotNone(http_args[1])
+            self.assertIs(http_args[1], http_args[2])
+
     @patch("backup.providers.google_drive.build")
     @patch.object(GoogleDriveClient, "refresh_token_if_needed")
     def test_get_file_metadata(self, mock_refresh, mock_build):
@@ -324,3 +451,119 @@ class GoogleDriveClientTests(TestCase):
             self.assertEqual(file.id, "file123")
             self.assertEqual(file.name, "document.pdf")
             self.assertEqual(file.size, 12345)
+
+    @patch("backup.providers.google_drive.MediaIoBaseDownload")
+    @patch("backup.providers.google_drive.build")
+    @patch.object(GoogleDriveClient, "refresh_token_if_needed")
+    def test_download_with_known_metadata_skips_lookup(
+        self, mock_refresh, mock_build, mock_downloader
+    ):
+        from io import BytesIO
+
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(
+                self.account,
+                access_token="test_token",
+                refresh_token="test_refresh",
+            )
+            mock_service = MagicMock()
+            mock_build.return_value = mock_service
+            mock_downloader.return_value.next_chunk.return_value = (None, True)
+            file_meta = DriveFile(
+                id="file123",
+                name="small.txt",
+                mime_type="text/plain",
+                size=5,
+                modified_time=datetime(2024, 1, 15, tzinfo=timezone.utc),
+                md5_checksum=None,
+                parents=["root"],
+                trashed=False,
+            )
+
+            client = GoogleDriveClient(self.account)
+            client.download_file_to_stream("file123", BytesIO(), file_meta=file_meta)
+
+            mock_service.files().get.assert_not_called()
+            mock_service.files().get_media.assert_called_once_with(fileId="file123")
+
+    @patch("backup.providers.google_drive.MediaIoBaseDownload")
+    @patch("backup.providers.google_drive.build")
+    @patch.object(GoogleDriveClient, "refresh_token_if_needed")
+    def test_download_google_doc_in_one_request(
+        self, mock_refresh, mock_build, mock_downloader
+    ):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(
+                self.account,
+                access_token="test_token",
+                refresh_token="test_refresh",
+            )
+            mock_service = MagicMock()
+            mock_build.return_value = mock_service
+            mock_service.files().export_media().execute.return_value = b"docx bytes"
+            file_meta = DriveFile(
+                id="doc123",
+                name="Notes",
+                mime_type="application/vnd.google-apps.document",
+                size=None,
+                modified_time=datetime(2024, 1, 15, tzinfo=timezone.utc),
+                md5_checksum=None,
+                parents=["root"],
+                trashed=False,
+            )
+
+            client = GoogleDriveClient(self.account)
+            buffer = client.download_file("doc123", file_meta=file_meta)
+
+            self.assertEqual(buffer.read(), b"docx bytes")
+            mock_service.files().export_media.assert_called_with(
+                fileId="doc123", mimeType=file_meta.export_mime_type
+            )
+            mock_downloader.assert_not_called()
+
+    @patch("backup.providers.google_drive.RANGED_DOWNLOAD_CHUNK_SIZE", 4)
+    @patch("backup.providers.google_drive.build")
+    @patch.object(GoogleDriveClient, "refresh_token_if_needed")
+    def test_download_large_file_in_ranges(self, mock_refresh, mock_build):
+        from io import BytesIO
+
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(
+                self.account,
+                access_token="test_token",
+                refresh_token="test_refresh",
+            )
+            data = b"0123456789"
+            mock_service = MagicMock()
+            mock_build.return_value = mock_service
+            mock_service.files().get().execute.return_value = {
+                "id": "file123",
+                "name": "big.bin",
+                "mimeType": "application/octet-stream",
+                "size": str(len(data)),
+                "modifiedTime": "2024-01-15T10:30:00.000Z",
+                "parents": ["root"],
+                "trashed": False,
+            }
+            ranges = []
+
+            class FakeMediaRequest:
+                def __init__(self):
+                    self.headers = {}
+
+                def execute(self, http=None):
+                    start, end = map(int, self.headers["Range"][len("bytes="):].split("-"))
+                    ranges.append((start, end))
+                    return data[start : end + 1]
+
+            mock_service.files().get_media.side_effect = (
+                lambda fileId: FakeMediaRequest()
+            )
+
+            stream = BytesIO()
+            client = GoogleDriveClient(self.account)
+            written = client.download_file_to_stream("file123", stream)
+
+            self.assertEqual(written, len(data))
+            self.assertEqual(stream.getvalue(), data)
+            self.assertEqual(sorted(ranges), [(0, 3), (4, 7), (8, 9)])
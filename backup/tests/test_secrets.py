@@ -4,6 +4,8 @@ import json
 import os
 import stat
 import tempfile
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import patch
@@ -63,6 +65,27 @@ class SecretsManagerTests(TestCase):
             tokens = secrets.get_tokens(other_account)
             self.assertIsNone(tokens)
 
+    def test_get_tokens_for_accounts(self):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            expires = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+            other_account = Account.objects.create(
+                provider=Provider.GOOGLE_DRIVE,
+                name="Other Account",
+                email="other@example.com",
+            )
+            secrets.set_tokens(
+                self.account,
+                access_token="test_access",
+                refresh_token="test_refresh",
+                expires_at=expires,
+            )
+
+            tokens = secrets.get_tokens_for_accounts([self.account, other_account])
+
+            self.assertEqual(tokens[self.account.id]["access_token"], "test_access")
+            self.assertEqual(tokens[self.account.id]["expires_at"], expires)
+            self.assertIsNone(tokens[other_account.id])
+
     def test_delete_tokens(self):
         with override_settings(SECRETS_FILE=self.secrets_file):
             secrets.set_tokens(
@@ -219,3 +242,96 @@ class SecretsManagerTests(TestCase):
 
             with self.assertRaises(secrets.SecretsFileError):
                 secrets._load_secrets()
+
+    def test_unchanged_file_read_once(self):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(
+                self.account,
+                access_token="access",
+                refresh_token="refresh",
+                expires_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            )
+
+            with patch("backup.secrets._read_secrets", wraps=secrets._read_secrets) as mock_read:
+                first = secrets.get_tokens(self.account)
+                second = secrets.get_tokens(self.account)
+
+            self.assertEqual(mock_read.call_count, 1)
+            # Parsing expires_at must not leak into the cached copy
+            self.assertEqual(first["expires_at"], datetime(2025, 1, 1, tzinfo=timezone.utc))
+            self.assertEqual(second["expires_at"], first["expires_at"])
+
+    def test_external_change_invalidates_cache(self):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(self.account, access_token="old", refresh_token="refresh")
+            self.assertEqual(secrets.get_tokens(self.account)["access_token"], "old")
+
+            key = f"{self.account.provider}:{self.account.email}"
+            self.secrets_file.write_text(json.dumps({
+                key: {"access_token": "rotated", "refresh_token": "refresh"},
+            }))
+
+            self.assertEqual(secrets.get_tokens(self.account)["access_token"], "rotated")
+
+    def test_same_size_replace_with_same_mtime_invalidates_cache(self):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(self.account, access_token="old1", refresh_token="refresh")
+            self.assertEqual(secrets.get_tokens(self.account)["access_token"], "old1")
+            st = self.secrets_file.stat()
+
+            # A same-size rewrite landing within the timestamp granularity
+            replacement = self.secrets_file.with_suffix(".new")
+            replacement.write_text(
+                self.secrets_file.read_text().replace('"old1"', '"new1"')
+            )
+            os.utime(replacement, ns=(st.st_atime_ns, st.st_mtime_ns))
+            os.replace(replacement, self.secrets_file)
+            self.assertEqual(self.secrets_file.stat().st_size, st.st_size)
+
+            self.assertEqual(secrets.get_tokens(self.account)["access_token"], "new1")
+
+    def test_concurrent_token_writes_are_coalesced(self):
+        accounts = [
+            Account.objects.create(
+                provider=Provider.GOOGLE_DRIVE,
+                name=f"Account {i}",
+                email=f"user{i}@example.com",
+            )
+            for i in range(3)
+        ]
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            with patch("backup.secrets._save_secrets", wraps=secrets._save_secrets) as mock_save:
+                # Hold the write lock so every refresh queues behind it
+                with secrets._write_lock:
+                    threads = [
+                        threading.Thread(
+                            target=secrets.set_tokens,
+                            args=(account,),
+                            kwargs={"access_token": f"token{i}", "refresh_token": "refresh"},
+                        )
+                        for i, account in enumerate(accounts)
+                    ]
+                    for thread in threads:
+                        thread.start()
+                    deadline = time.monotonic() + 5
+                    while len(secrets._pending_tokens) < 3 and time.monotonic() < deadline:
+                        time.sleep(0.01)
+
+                for thread in threads:
+                    thread.join()
+
+            self.assertEqual(mock_save.call_count, 1)
+            for i, account in enumerate(accounts):
+                self.assertEqual(secrets.get_tokens(account)["access_token"], f"token{i}")
+
+    def test_delete_drops_queued_update(self):
+        with override_settings(SECRETS_FILE=self.secrets_file):
+            secrets.set_tokens(self.account, access_token="token", refresh_token="refresh")
+            secrets._pending_tokens[secrets._get_account_key(self.account)] = {
+                "access_token": "late", "refresh_token": "refresh", "expires_at": None,
+            }
+
+            self.assertTrue(secrets.delete_tokens(self.account))
+            self.assertEqual(secrets._pending_tokens, {})
+            self.assertIsNone(secrets.get_tokens(self.account))
+
@@ -1,3 +1,5 @@
+import errno
+import os
 import tempfile
 from io import BytesIO
 from pathlib import Path
@@ -7,9 +9,11 @@ from django.test import TestCase, override_settings
 
 from backup.models import Account, Provider
 from backup.storage import (
+    FICLONE,
     AccountStorage,
     BlobNotFoundError,
     DigestError,
+    HashingWriter,
     compute_digest,
     parse_digest,
 )
@@ -52,6 +56,34 @@ class ComputeDigestTests(TestCase):
         expected = compute_digest(data)
         self.assertEqual(digest, expected)
 
+    @override_settings(BACKUP_IO_CHUNK_SIZE=4)
+    def test_compute_from_stream_in_several_chunks(self):
+        data = b"hello world, in pieces"
+
+        class ReadOnlyStream:
+            def __init__(self, data):
+                self._stream = BytesIO(data)
+
+            def read(self, size=-1):
+                return self._stream.read(size)
+
+        expected = compute_digest(data)
+        self.assertEqual(compute_digest(BytesIO(data)), expected)
+        self.assertEqual(compute_digest(ReadOnlyStream(data)), expected)
+
+    def test_compute_from_file_hashes_rest_in_one_call(self):
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b"skip:file content")
+            f.flush()
+            f.seek(5)
+
+            with patch("backup.storage._read_chunks") as mock_chunks:
+                digest = compute_digest(f)
+
+            mock_chunks.assert_not_called()
+            self.assertEqual(digest, compute_digest(b"file content"))
+            self.assertEqual(f.read(), b"")
+
     def test_known_hash(self):
         # SHA256 of empty string
         digest = compute_digest(b"")
@@ -61,6 +93,30 @@ class ComputeDigestTests(TestCase):
         )
 
 
+class HashingWriterTests(TestCase):
+    def test_sequential_writes_are_hashed(self):
+        stream = BytesIO()
+        writer = HashingWriter(stream)
+
+        writer.write(b"hello ")
+        writer.write(b"world")
+
+        self.assertEqual(writer.digest(), compute_digest(b"hello world"))
+        self.assertEqual(stream.getvalue(), b"hello world")
+
+    def test_out_of_order_writes_give_no_digest(self):
+        stream = BytesIO()
+        writer = HashingWriter(stream)
+
+        writer.seek(6)
+        writer.write(b"world")
+        writer.seek(0)
+        writer.write(b"hello ")
+
+        self.assertIsNone(writer.digest())
+        self.assertEqual(stream.getvalue(), b"hello world")
+
+
 class AccountStorageTests(TestCase):
     def setUp(self):
         self.temp_dir = tempfile.mkdtemp()
@@ -91,6 +147,15 @@ class AccountStorageTests(TestCase):
         self.assertEqual(storage.tmp_dir, expected_root / "tmp")
         self.assertEqual(storage.archive_dir, expected_root / "archive")
 
+    @override_settings(BACKUP_ROOT=Path("/tmp/test_backup"))
+    def test_for_account_id_matches_account_paths(self):
+        storage = AccountStorage.for_account_id(self.account.id, self.account.provider)
+        expected = AccountStorage(self.account)
+        self.assertIsNone(storage.account)
+        self.assertEqual(storage.root, expected.root)
+        self.assertEqual(storage.blobs_dir, expected.blobs_dir)
+        self.assertEqual(storage.archive_dir, expected.archive_dir)
+
     def test_ensure_directories(self):
         with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
             storage = AccountStorage(self.account)
@@ -101,6 +166,16 @@ class AccountStorageTests(TestCase):
             self.assertTrue(storage.tmp_dir.exists())
             self.assertTrue(storage.archive_dir.exists())
 
+    def test_ensure_directories_only_creates_once(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            storage.ensure_directories()
+
+            with patch.object(Path, "mkdir") as mock_mkdir:
+                storage.ensure_directories()
+
+            mock_mkdir.assert_not_called()
+
     def test_get_blob_path(self):
         with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
             storage = AccountStorage(self.account)
@@ -113,6 +188,11 @@ class AccountStorageTests(TestCase):
             self.assertIn("ab", str(path))
             self.assertIn("cd", str(path))
             self.assertTrue(str(path).endswith("abcdef1234567890" + "0" * 48))
+            self.assertEqual(
+                path,
+                storage.blobs_dir / "sha256" / "ab" / "cd" / ("abcdef1234567890" + "0" * 48),
+            )
+            self.assertEqual(storage.get_blob_path_str(digest), str(path))
 
     def test_write_and_read_blob_bytes(self):
         with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
@@ -139,6 +219,162 @@ class AccountStorageTests(TestCase):
             content = storage.read_blob_bytes(digest)
             self.assertEqual(content, data)
 
+    def test_write_blob_from_local_file(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            source = Path(self.temp_dir) / "upload.bin"
+            source.write_bytes(b"skip:local file content")
+
+            with open(source, "rb") as f:
+                f.seek(5)
+                digest = storage.write_blob(f)
+                self.assertEqual(f.tell(), source.stat().st_size)
+
+            self.assertEqual(digest, compute_digest(b"local file content"))
+            self.assertEqual(storage.read_blob_bytes(digest), b"local file content")
+
+    @patch("backup.storage.os.sendfile", side_effect=OSError)
+    @patch("backup.storage.os.copy_file_range", side_effect=OSError)
+    def test_write_blob_from_local_file_without_kernel_copy(self, mock_cfr, mock_sendfile):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            source = Path(self.temp_dir) / "upload.bin"
+            source.write_bytes(b"local file content")
+
+            with open(source, "rb") as f:
+                digest = storage.write_blob(f)
+
+            mock_cfr.assert_called_once()
+            self.assertEqual(digest, compute_digest(b"local file content"))
+            self.assertEqual(storage.read_blob_bytes(digest), b"local file content")
+
+    def test_blob_data_synced_before_rename(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            synced = []
+
+            def datasync(fd):
+                # The temp file is synced while it still has its temp name
+                synced.append(os.listdir(storage.tmp_dir))
+
+            with patch("backup.storage.os.fdatasync", side_effect=datasync):
+                storage.write_blob(b"12345")
+                # Rewriting existing content syncs nothing
+                storage.write_blob(b"12345")
+
+            self.assertEqual(len(synced), 1)
+            self.assertEqual(len(synced[0]), 1)
+
+    def test_blob_directories_synced_in_batches(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+
+            with patch("backup.storage.os.fsync") as mock_fsync:
+                storage.write_blob(b"12345")
+                storage.write_blob(b"67890")
+                self.assertEqual(mock_fsync.call_count, 0)
+
+                storage.flush_pending()
+                self.assertEqual(mock_fsync.call_count, 2)
+
+    def test_write_blob_from_path_moves_file(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            storage.ensure_directories()
+            path = storage.tmp_dir / "download.tmp"
+            path.write_bytes(b"downloaded content")
+            inode = path.stat().st_ino
+
+            digest = storage.write_blob_from_path(path)
+
+            self.assertFalse(path.exists())
+            blob_path = storage.get_blob_path(digest)
+            self.assertEqual(blob_path.stat().st_ino, inode)
+            self.assertEqual(blob_path.stat().st_mode & 0o777, 0o444)
+            self.assertEqual(storage.read_blob_bytes(digest), b"downloaded content")
+
+            # A second copy of stored content is just removed
+            path.write_bytes(b"downloaded content")
+            self.assertEqual(storage.write_blob_from_path(path), digest)
+            self.assertFalse(path.exists())
+
+    def test_write_blob_from_path_uses_known_digest(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            storage.ensure_directories()
+            path = storage.tmp_dir / "download.tmp"
+            path.write_bytes(b"downloaded content")
+            digest = compute_digest(b"downloaded content")
+
+            with patch("backup.storage._hash_mapped") as mock_hash:
+                self.assertEqual(storage.write_blob_from_path(path, digest=digest), digest)
+
+            mock_hash.assert_not_called()
+            self.assertTrue(storage.blob_exists(digest))
+
+    def test_write_blob_from_path_mismatch_removes_file(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            storage.ensure_directories()
+            path = storage.tmp_dir / "download.tmp"
+            path.write_bytes(b"truncated")
+
+            with self.assertRaises(DigestError):
+                storage.write_blob_from_path(path, compute_digest(b"full content"))
+
+            self.assertFalse(path.exists())
+
+    def test_write_blob_recreates_shard_removed_elsewhere(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            other = AccountStorage(self.account)
+            digest = storage.write_blob(b"content")
+
+            # Another instance (e.g. GC) deletes the blob and its empty shard
+            other.delete_blob(digest)
+            self.assertFalse(storage.get_blob_path(digest).parent.exists())
+
+            self.assertEqual(storage.write_blob(b"content"), digest)
+            self.assertEqual(storage.read_blob_bytes(digest), b"content")
+
+    def test_flush_pending_drops_blobs_from_page_cache(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            storage.write_blob(b"cold content")
+
+            with patch("backup.storage.os.posix_fadvise", create=True) as mock_fadvise:
+                storage.flush_pending()
+
+            mock_fadvise.assert_called_once()
+            self.assertEqual(mock_fadvise.call_args.args[1:], (0, 0, os.POSIX_FADV_DONTNEED))
+
+    def test_batched_sync_keeps_blobs_in_page_cache(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+
+            with patch("backup.storage.BLOB_SYNC_MAX_PENDING", 1), patch(
+                "backup.storage.os.posix_fadvise", create=True
+            ) as mock_fadvise:
+                storage.write_blob(b"hot content")
+                self.assertEqual(storage._unsynced, [])
+                mock_fadvise.assert_not_called()
+
+                storage.flush_pending()
+                mock_fadvise.assert_called_once()
+
+    def test_flush_pending_skips_deleted_blobs(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            kept = storage.write_blob(b"kept")
+            deleted = storage.write_blob(b"deleted")
+            storage.delete_blob(deleted)
+
+            with patch("backup.storage.os.fsync") as mock_fsync:
+                storage.flush_pending()
+
+            self.assertEqual(mock_fsync.call_count, 1)
+            self.assertTrue(storage.blob_exists(kept))
+
     def test_write_blob_with_expected_digest(self):
         with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
             storage = AccountStorage(self.account)
@@ -149,6 +385,46 @@ class AccountStorageTests(TestCase):
 
             self.assertEqual(digest, expected)
 
+    def _corrupt_blob(self, storage, digest):
+        path = storage.get_blob_path(digest)
+        path.chmod(0o644)
+        path.write_bytes(b"tampered")
+
+    def test_read_blob_detects_corruption_on_open(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            digest = storage.write_blob(b"original content")
+            self._corrupt_blob(storage, digest)
+
+            with self.assertRaises(DigestError):
+                storage.read_blob(digest)
+
+    def test_read_large_blob_verified_while_reading(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir), BACKUP_MMAP_VERIFY_MAX=4):
+            storage = AccountStorage(self.account)
+            digest = storage.write_blob(b"original content")
+            self.assertEqual(storage.read_blob_bytes(digest), b"original content")
+
+            self._corrupt_blob(storage, digest)
+            with self.assertRaises(DigestError):
+                storage.read_blob_bytes(digest)
+
+    def test_partially_read_blob_verified_on_close(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir), BACKUP_MMAP_VERIFY_MAX=4):
+            storage = AccountStorage(self.account)
+            digest = storage.write_blob(b"original content")
+
+            # Closing after a partial read must hash the rest, not fail
+            with storage.read_blob(digest) as f:
+                self.assertEqual(f.read(8), b"original")
+
+    def test_read_empty_blob(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            digest = storage.write_blob(b"")
+
+            self.assertEqual(storage.read_blob_bytes(digest), b"")
+
     def test_write_blob_with_wrong_expected_digest(self):
         with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
             storage = AccountStorage(self.account)
@@ -195,6 +471,7 @@ class AccountStorageTests(TestCase):
             digest = storage.write_blob(data)
 
             self.assertTrue(storage.blob_exists(digest))
+            self.assertEqual(storage.get_blob_path(digest).stat().st_mode & 0o777, 0o444)
             result = storage.delete_blob(digest)
             self.assertTrue(result)
             self.assertFalse(storage.blob_exists(digest))
@@ -220,6 +497,68 @@ class AccountStorageTests(TestCase):
             self.assertEqual(path.read_bytes(), data)
             self.assertEqual(path, storage.current_dir / "folder" / "file.txt")
 
+    @patch("backup.storage.shutil.copy2")
+    @patch("backup.storage.fcntl")
+    def test_materialize_prefers_reflink(self, mock_fcntl, mock_copy):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            digest = storage.write_blob(b"file content")
+
+            path = storage.materialize_to_current(digest, "file.txt", use_hardlink=True)
+
+            mock_fcntl.ioctl.assert_called_once()
+            self.assertEqual(mock_fcntl.ioctl.call_args.args[1], FICLONE)
+            mock_copy.assert_not_called()
+            self.assertEqual(path.stat().st_nlink, 1)
+
+    @patch("backup.storage.fcntl")
+    def test_materialize_falls_back_when_reflink_unsupported(self, mock_fcntl):
+        mock_fcntl.ioctl.side_effect = OSError("Operation not supported")
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            digest = storage.write_blob(b"file content")
+
+            path = storage.materialize_to_current(digest, "file.txt")
+
+            self.assertEqual(path.read_bytes(), b"file content")
+
+    @patch("backup.storage.fcntl")
+    def test_materialize_stops_probing_unsupported_reflink(self, mock_fcntl):
+        mock_fcntl.ioctl.side_effect = OSError(errno.EOPNOTSUPP, "Operation not supported")
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            digest = storage.write_blob(b"file content")
+
+            storage.materialize_to_current(digest, "first.txt")
+            path = storage.materialize_to_current(digest, "second.txt")
+
+            mock_fcntl.ioctl.assert_called_once()
+            self.assertEqual(path.read_bytes(), b"file content")
+
+    @patch("backup.storage.os.sendfile", side_effect=OSError)
+    @patch("backup.storage.os.copy_file_range", side_effect=OSError)
+    def test_materialize_copies_without_kernel_copy(self, mock_cfr, mock_sendfile):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir), BACKUP_TRY_REFLINK=False):
+            storage = AccountStorage(self.account)
+            digest = storage.write_blob(b"file content")
+
+            path = storage.materialize_to_current(digest, "file.txt")
+
+            mock_cfr.assert_called()
+            self.assertEqual(path.read_bytes(), b"file content")
+            self.assertEqual(path.stat().st_mode & 0o777, 0o444)
+
+    @patch("backup.storage.fcntl")
+    def test_materialize_reflink_can_be_disabled(self, mock_fcntl):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir), BACKUP_TRY_REFLINK=False):
+            storage = AccountStorage(self.account)
+            digest = storage.write_blob(b"file content")
+
+            path = storage.materialize_to_current(digest, "file.txt")
+
+            mock_fcntl.ioctl.assert_not_called()
+            self.assertEqual(path.read_bytes(), b"file content")
+
     def test_materialize_overwrites_existing(self):
         with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
             storage = AccountStorage(self.account)
@@ -271,6 +610,30 @@ class AccountStorageTests(TestCase):
             self.assertEqual(archive_path.read_bytes(), data)
             self.assertFalse((storage.current_dir / "folder" / "file.txt").exists())
 
+    def test_move_to_archive_replaces_existing(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            storage.materialize_to_current(storage.write_blob(b"old"), "file.txt")
+            storage.move_to_archive("file.txt")
+            storage.materialize_to_current(storage.write_blob(b"new"), "file.txt")
+
+            archive_path = storage.move_to_archive("file.txt")
+
+            self.assertEqual(archive_path.read_bytes(), b"new")
+
+    def test_move_to_archive_across_filesystems(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+            storage.materialize_to_current(storage.write_blob(b"old"), "file.txt")
+            storage.move_to_archive("file.txt")
+            storage.materialize_to_current(storage.write_blob(b"new"), "file.txt")
+
+            with patch("backup.storage.os.replace", side_effect=OSError(errno.EXDEV, "cross-device")):
+                archive_path = storage.move_to_archive("file.txt")
+
+            self.assertEqual(archive_path.read_bytes(), b"new")
+            self.assertFalse((storage.current_dir / "file.txt").exists())
+
     def test_restore_from_archive(self):
         with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
             storage = AccountStorage(self.account)
@@ -303,3 +666,14 @@ class AccountStorageTests(TestCase):
             self.assertEqual(stats["blob_count"], 2)
             self.assertEqual(stats["total_size_bytes"], len(data1) + len(data2))
             self.assertEqual(stats["current_file_count"], 2)
+
+    def test_get_storage_stats_before_first_write(self):
+        with override_settings(BACKUP_ROOT=Path(self.temp_dir)):
+            storage = AccountStorage(self.account)
+
+            stats = storage.get_storage_stats()
+
+            self.assertEqual(
+                stats,
+                {"blob_count": 0, "total_size_bytes": 0, "current_file_count": 0},
+            )
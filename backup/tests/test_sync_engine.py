@@ -1,6 +1,7 @@
 """Tests for the SyncEngine."""
 
 import tempfile
+import threading
 from datetime import datetime, timezone
 from io import BytesIO
 from pathlib import Path
@@ -28,7 +29,7 @@ from backup.providers.google_drive import (
     GoogleDriveClient,
 )
 from backup.storage import AccountStorage
-from backup.sync import SyncEngine
+from backup.sync import PathBuilder, SyncEngine
 from backup.sync.exceptions import DownloadError, SyncAbortedError, TokenRefreshError
 from backup.sync.models import SyncEvent, SyncSession
 
@@ -256,7 +257,7 @@ class InitialSyncTests(SyncEngineTestCase):
             }
 
             # Mock download
-            def mock_download_impl(file_id, stream):
+            def mock_download_impl(file_id, stream, file_meta=None):
                 stream.write(b"test content")
                 return 12
 
@@ -454,6 +455,50 @@ class StateTransitionTests(SyncEngineTestCase):
             self.assertEqual(item.missing_since_sync_count, 2)
             self.assertEqual(result.files_quarantined, 1)
 
+    def test_quarantine_keeps_latest_version(self):
+        """Quarantining should snapshot each file's newest version as PRE_DELETE."""
+        with override_settings(BACKUP_ROOT=self.backup_root):
+            engine = SyncEngine(self.sync_root, AccountStorage(self.account), MagicMock())
+            engine.session = SyncSession.objects.create(sync_root=self.sync_root)
+            engine.sync_start_time = datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+            old_blob, new_blob = (
+                BackupBlob.objects.create(digest=f"sha256:{c * 64}", account=self.account, size_bytes=1)
+                for c in "ab"
+            )
+            items = [
+                BackupItem.objects.create(
+                    sync_root=self.sync_root,
+                    provider_item_id=f"file{i}",
+                    name=f"file{i}.txt",
+                    path=f"file{i}.txt",
+                    item_type=ItemType.FILE,
+                    missing_since_sync_count=1,
+                    last_seen_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                )
+                for i in range(2)
+            ]
+            for day, blob in [(1, old_blob), (2, new_blob)]:
+                version = FileVersion.objects.create(
+                    account=self.account,
+                    backup_item=items[0],
+                    blob=blob,
+                    observed_path=items[0].path,
+                    reason=VersionReason.UPDATE,
+                )
+                FileVersion.objects.filter(pk=version.pk).update(
+                    captured_at=datetime(2024, 1, day, tzinfo=timezone.utc)
+                )
+
+            self.assertEqual(engine._update_deletion_states(), 2)
+
+            pre_delete = FileVersion.objects.get(reason=VersionReason.PRE_DELETE)
+            self.assertEqual(pre_delete.backup_item, items[0])
+            self.assertEqual(pre_delete.blob, new_blob)
+            self.assertEqual(
+                engine.session.events.filter(event_type="file_quarantined").count(), 2
+            )
+
     @patch("backup.providers.google_drive.build")
     @patch.object(GoogleDriveClient, "refresh_token_if_needed")
     @patch.object(GoogleDriveClient, "download_file_to_stream")
@@ -519,7 +564,7 @@ class StateTransitionTests(SyncEngineTestCase):
                 "etag": "etag123",
             }
 
-            def mock_download_impl(file_id, stream):
+            def mock_download_impl(file_id, stream, file_meta=None):
                 stream.write(b"test content")
                 return 12
 
@@ -651,7 +696,7 @@ class ErrorHandlingTests(SyncEngineTestCase):
             # First file fails, second succeeds
             call_count = [0]
 
-            def mock_download_impl(file_id, stream):
+            def mock_download_impl(file_id, stream, file_meta=None):
                 call_count[0] += 1
                 if call_count[0] == 1:
                     raise FileNotDownloadableError("Cannot download")
@@ -800,6 +845,76 @@ class FolderHandlingTests(SyncEngineTestCase):
             self.assertTrue(folder_path.exists())
             self.assertTrue(folder_path.is_dir())
 
+    @patch("backup.providers.google_drive.build")
+    @patch.object(GoogleDriveClient, "refresh_token_if_needed")
+    def test_folders_upserted_in_batch(self, mock_refresh, mock_build):
+        """Queued folders should be created or updated together with one event per new folder."""
+        with override_settings(SECRETS_FILE=self.secrets_file, BACKUP_ROOT=self.backup_root):
+            secrets.set_tokens(
+                self.account, access_token="test", refresh_token="test"
+            )
+            BackupItem.objects.create(
+                sync_root=self.sync_root,
+                provider_item_id="folder1",
+                name="Old Name",
+                path="Old Name",
+                item_type=ItemType.FOLDER,
+            )
+
+            engine = SyncEngine(
+                self.sync_root, AccountStorage(self.account), GoogleDriveClient(self.account)
+            )
+            engine.session = SyncSession.objects.create(sync_root=self.sync_root)
+            folder_mime = "application/vnd.google-apps.folder"
+            changes = [
+                self._make_change(
+                    file_id=file_id,
+                    file=self._make_drive_file(file_id=file_id, name=name, mime_type=folder_mime),
+                )
+                for file_id, name in [("folder1", "Documents"), ("folder2", "Photos")]
+            ]
+
+            result = engine._process_change_batch(changes, "token123")
+
+            self.assertEqual(result.files_added, 1)
+            self.assertEqual(result.files_updated, 1)
+            self.assertEqual(BackupItem.objects.get(provider_item_id="folder1").name, "Documents")
+            self.assertTrue((engine.storage.current_dir / "Photos").is_dir())
+            events = SyncEvent.objects.filter(session=engine.session, event_type="file_added")
+            self.assertEqual(
+                list(events.values_list("provider_file_id", flat=True)), ["folder2"]
+            )
+
+    @patch("backup.providers.google_drive.build")
+    @patch.object(GoogleDriveClient, "refresh_token_if_needed")
+    def test_queued_folder_flushed_before_deletion(self, mock_refresh, mock_build):
+        """A folder added then removed in the same batch should end up deleted."""
+        with override_settings(SECRETS_FILE=self.secrets_file, BACKUP_ROOT=self.backup_root):
+            secrets.set_tokens(
+                self.account, access_token="test", refresh_token="test"
+            )
+
+            engine = SyncEngine(
+                self.sync_root, AccountStorage(self.account), GoogleDriveClient(self.account)
+            )
+            engine.session = SyncSession.objects.create(sync_root=self.sync_root)
+            folder = self._make_drive_file(
+                file_id="folder1", name="Documents", mime_type="application/vnd.google-apps.folder"
+            )
+            changes = [
+                self._make_change(file_id="folder1", file=folder),
+                self._make_change(file_id="folder1", removed=True),
+            ]
+
+            result = engine._process_change_batch(changes, "token123")
+
+            self.assertEqual(result.files_added, 1)
+            self.assertEqual(result.files_deleted, 1)
+            self.assertEqual(
+                BackupItem.objects.get(provider_item_id="folder1").state,
+                ItemState.DELETED_UPSTREAM,
+            )
+
 
 class BatchProcessingTests(SyncEngineTestCase):
     """Tests for batch processing behavior."""
@@ -835,6 +950,81 @@ class BatchProcessingTests(SyncEngineTestCase):
             self.sync_root.refresh_from_db()
             self.assertEqual(self.sync_root.sync_cursor, "token123")
 
+    def test_file_changed_twice_in_one_batch(self):
+        """A second change to a file created earlier in the batch should update it."""
+        with override_settings(BACKUP_ROOT=self.backup_root):
+            client = MagicMock()
+            client.download_file_to_stream.side_effect = (
+                lambda file_id, stream, file_meta=None: stream.write(b"content")
+            )
+            engine = SyncEngine(self.sync_root, AccountStorage(self.account), client)
+            engine.session = SyncSession.objects.create(sync_root=self.sync_root)
+            changes = [
+                self._make_change(file=self._make_drive_file(etag="v1")),
+                self._make_change(file=self._make_drive_file(etag="v2")),
+            ]
+
+            result = engine._process_change_batch(changes, "token123")
+
+            self.assertEqual(result.errors, [])
+            self.assertEqual(result.files_added, 1)
+            self.assertEqual(result.files_updated, 1)
+            self.assertEqual(BackupItem.objects.get(provider_item_id="file1").etag, "v2")
+
+    def test_batch_downloads_run_concurrently(self):
+        """New files in a batch should be downloaded on worker threads."""
+        with override_settings(BACKUP_ROOT=self.backup_root, BACKUP_DOWNLOAD_WORKERS=4):
+            threads = set()
+
+            def download(file_id, stream, file_meta=None):
+                threads.add(threading.current_thread().name)
+                stream.write(file_id.encode())
+
+            client = MagicMock()
+            client.download_file_to_stream.side_effect = download
+            engine = SyncEngine(self.sync_root, AccountStorage(self.account), client)
+            engine.session = SyncSession.objects.create(sync_root=self.sync_root)
+            changes = [
+                self._make_change(
+                    file_id=f"file{i}",
+                    file=self._make_drive_file(file_id=f"file{i}", name=f"file{i}.txt"),
+                )
+                for i in range(3)
+            ]
+
+            result = engine._process_change_batch(changes, "token123")
+
+            self.assertEqual(result.files_added, 3)
+            self.assertEqual(client.download_file_to_stream.call_count, 3)
+            self.assertTrue(all(name.startswith("download") for name in threads))
+            self.assertEqual(
+                (engine.storage.current_dir / "file2.txt").read_bytes(), b"file2"
+            )
+            self.assertEqual(list(engine.storage.tmp_dir.iterdir()), [])
+
+    def test_failed_change_events_discarded(self):
+        """Events queued by a change that rolled back should not be saved."""
+        with override_settings(BACKUP_ROOT=self.backup_root):
+            client = MagicMock()
+            client.download_file_to_stream.side_effect = (
+                lambda file_id, stream, file_meta=None: stream.write(b"content")
+            )
+            storage = AccountStorage(self.account)
+            engine = SyncEngine(self.sync_root, storage, client)
+            engine.session = SyncSession.objects.create(sync_root=self.sync_root)
+
+            with patch.object(storage, "materialize_to_current", side_effect=OSError("disk full")):
+                result = engine._process_change_batch(
+                    [self._make_change(file=self._make_drive_file())], "token123"
+                )
+
+            self.assertEqual(len(result.errors), 1)
+            self.assertFalse(BackupItem.objects.exists())
+            self.assertEqual(
+                sorted(engine.session.events.values_list("event_type", flat=True)),
+                ["checkpoint", "error"],
+            )
+
 
 class FileVersionTests(SyncEngineTestCase):
     """Tests for FileVersion creation during sync."""
@@ -891,7 +1081,7 @@ class FileVersionTests(SyncEngineTestCase):
                 "etag": "etag123",
             }
 
-            def mock_download_impl(file_id, stream):
+            def mock_download_impl(file_id, stream, file_meta=None):
                 stream.write(b"test content")
                 return 12
 
@@ -912,6 +1102,21 @@ class FileVersionTests(SyncEngineTestCase):
             # Check blob exists
             self.assertTrue(BackupBlob.objects.filter(pk=version.blob.digest).exists())
 
+    def test_stored_content_not_downloaded_again(self):
+        """A file whose reported SHA-256 is already stored is not downloaded."""
+        with override_settings(BACKUP_ROOT=self.backup_root):
+            storage = AccountStorage(self.account)
+            digest = storage.write_blob(b"test content")
+            drive_file = self._make_drive_file(size=12)
+            drive_file.sha256_checksum = digest.split(":", 1)[1]
+            client = MagicMock()
+            engine = SyncEngine(self.sync_root, storage, client)
+
+            self.assertEqual(engine._download_and_store(drive_file), digest)
+
+            client.download_file_to_stream.assert_not_called()
+            self.assertEqual(BackupBlob.objects.get(pk=digest).size_bytes, 12)
+
     @patch("backup.providers.google_drive.build")
     @patch.object(GoogleDriveClient, "refresh_token_if_needed")
     def test_pre_delete_version_created_on_deletion(self, mock_refresh, mock_build):
@@ -976,3 +1181,80 @@ class FileVersionTests(SyncEngineTestCase):
                 backup_item=item, reason=VersionReason.PRE_DELETE
             )
             self.assertEqual(pre_delete.count(), 1)
+
+
+class PathBuilderTests(SyncEngineTestCase):
+    """Tests for path conflict resolution."""
+
+    def test_conflicting_names_get_counter_suffix(self):
+        """New files should not reuse a path held by an existing or earlier file."""
+        BackupItem.objects.create(
+            sync_root=self.sync_root,
+            provider_item_id="existing",
+            name="report.pdf",
+            path="report.pdf",
+            item_type=ItemType.FILE,
+        )
+        builder = PathBuilder(self.sync_root)
+
+        with self.assertNumQueries(0):
+            first = builder.build_path(self._make_drive_file(file_id="new1", name="report.pdf"))
+            second = builder.build_path(self._make_drive_file(file_id="new2", name="report.pdf"))
+
+        self.assertEqual(first, "report (1).pdf")
+        self.assertEqual(second, "report (2).pdf")
+        self.assertEqual(
+            builder.build_path(self._make_drive_file(file_id="existing", name="report.pdf")),
+            "report.pdf",
+        )
+
+    def test_forgotten_path_can_be_reused(self):
+        """A deleted item's path should not make a new file take a suffix."""
+        BackupItem.objects.create(
+            sync_root=self.sync_root,
+            provider_item_id="deleted",
+            name="report.pdf",
+            path="report.pdf",
+            item_type=ItemType.FILE,
+        )
+        builder = PathBuilder(self.sync_root)
+
+        builder.forget("deleted")
+
+        self.assertEqual(
+            builder.build_path(self._make_drive_file(file_id="new", name="report.pdf")),
+            "report.pdf",
+        )
+
+    def test_missing_parent_looked_up_once(self):
+        """Children of a parent that isn't synced yet should share one lookup."""
+        builder = PathBuilder(self.sync_root)
+
+        with self.assertNumQueries(1):
+            paths = [
+                builder.build_path(
+                    self._make_drive_file(file_id=f"child{i}", name=f"{i}.txt", parents=["later"])
+                )
+                for i in range(3)
+            ]
+
+        self.assertEqual(paths, [f"_pending_/later/{i}.txt" for i in range(3)])
+
+    def test_missing_parent_looked_up_again_after_clear(self):
+        """A parent created after the lookup should be found once the batch ends."""
+        builder = PathBuilder(self.sync_root)
+        builder.build_path(self._make_drive_file(file_id="child0", parents=["later"]))
+        BackupItem.objects.create(
+            sync_root=self.sync_root,
+            provider_item_id="later",
+            name="Later",
+            path="Later",
+            item_type=ItemType.FOLDER,
+        )
+
+        builder.clear_missing_parents()
+        path = builder.build_path(
+            self._make_drive_file(file_id="child1", name="1.txt", parents=["later"])
+        )
+
+        self.assertEqual(path, "Later/1.txt")
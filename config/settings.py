@@ -126,6 +126,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Backup storage settings
 BACKUP_ROOT = BASE_DIR / 'backup_data'
+BACKUP_DOWNLOAD_WORKERS = 8  # Files downloaded concurrently within a sync batch
+BACKUP_TRY_REFLINK = True  # Clone blobs into current/ on filesystems with reflink support
+BACKUP_MMAP_VERIFY_MAX = 256 * 1024 * 1024  # Blobs up to this size are verified in one pass when opened
+BACKUP_IO_CHUNK_SIZE = 1024 * 1024  # Read size when hashing or copying blob streams
 
 # Secrets file for OAuth tokens (stored outside database)
 # File will be created with chmod 600 permissions
@@ -166,6 +170,8 @@ SYNC_DOWNLOAD_TIMEOUT = 300  # Download timeout in seconds
 GC_BATCH_SIZE = 100  # Number of items to process per batch
 GC_DEFAULT_KEEP_DAYS = 30  # Days to keep versions and quarantined items
 GC_DEFAULT_KEEP_VERSIONS = 10  # Minimum number of versions to keep per file
+GC_DELETE_WORKERS = 16  # Threads used to unlink archived files
+GC_DELETE_CHUNK_SIZE = 10000  # Max rows removed per DELETE statement
 
 # Celery configuration
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')